@@ -2,9 +2,12 @@
 CLI for Cubbi Container Tool.
 """
 
+import concurrent.futures
 import logging
 import os
 import shutil
+import subprocess
+import sys
 import tempfile
 from pathlib import Path
 from typing import List, Optional
@@ -16,7 +19,7 @@ from rich.table import Table
 from .config import ConfigManager
 from .configure import run_interactive_config
 from .container import ContainerManager
-from .mcp import MCPManager
+from .mcp import MCP_MAX_WORKERS, MCPManager
 from .models import SessionStatus
 from .session import SessionManager
 from .user_config import UserConfigManager
@@ -110,11 +113,7 @@ def list_sessions() -> None:
             SessionStatus.FAILED: "red",
         }.get(session.status, "white")
 
-        status_name = (
-            session.status.value
-            if hasattr(session.status, "value")
-            else str(session.status)
-        )
+        status_name = str(session.status)
 
         table.add_row(
             session.id,
@@ -695,11 +694,11 @@ def build_image(
 
             # Build the image from temporary directory
             with console.status(f"Building image {docker_image_name}..."):
-                build_cmd = f"cd {temp_path} && docker build"
+                build_cmd = ["docker", "build"]
                 if no_cache:
-                    build_cmd += " --no-cache"
-                build_cmd += f" -t {docker_image_name} ."
-                result = os.system(build_cmd)
+                    build_cmd.append("--no-cache")
+                build_cmd += ["-t", docker_image_name, "."]
+                result = subprocess.run(build_cmd, cwd=temp_path).returncode
 
         except Exception as e:
             console.print(f"[red]Error preparing build context: {e}[/red]")
@@ -714,7 +713,7 @@ def build_image(
     # Push if requested
     if push:
         with console.status(f"Pushing image {docker_image_name}..."):
-            result = os.system(f"docker push {docker_image_name}")
+            result = subprocess.run(["docker", "push", docker_image_name]).returncode
 
         if result != 0:
             console.print("[red]Failed to push image[/red]")
@@ -1188,13 +1187,19 @@ def list_mcps() -> None:
     table.add_column("Ports")
     table.add_column("Details")
 
-    # Check status of each MCP
+    # Check the status of every MCP with a single container listing
+    try:
+        statuses = mcp_manager.get_all_mcp_statuses()
+    except Exception as e:
+        console.print(f"[red]Error checking MCP status: {e}[/red]")
+        statuses = {}
+
     for mcp in mcps:
         name = mcp.get("name", "")
         mcp_type = mcp.get("type", "")
 
         try:
-            status_info = mcp_manager.get_mcp_status(name)
+            status_info = statuses.get(name, {})
             status = status_info.get("status", "unknown")
 
             # Set status color based on status
@@ -1459,16 +1464,21 @@ def stop_mcp(
 
         console.print(f"Stopping and removing {len(mcps)} MCP servers...")
 
-        for mcp in mcps:
-            mcp_name = mcp.get("name")
-            if not mcp_name:
-                continue
-
+        # Stop the servers in parallel, each stop waits up to 10s for its
+        # container to exit
+        mcp_names = [mcp.get("name") for mcp in mcps if mcp.get("name")]
+        with console.status("Stopping and removing MCP servers..."):
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(MCP_MAX_WORKERS, len(mcp_names) or 1)
+            ) as executor:
+                stop_futures = [
+                    executor.submit(mcp_manager.stop_mcp, mcp_name)
+                    for mcp_name in mcp_names
+                ]
+
+        for mcp_name, stop_future in zip(mcp_names, stop_futures):
             try:
-                with console.status(
-                    f"Stopping and removing MCP server '{mcp_name}'..."
-                ):
-                    result = mcp_manager.stop_mcp(mcp_name)
+                result = stop_future.result()
 
                 if result:
                     console.print(
@@ -1611,8 +1621,12 @@ def mcp_logs(
 ) -> None:
     """Show logs from an MCP server"""
     try:
-        logs = mcp_manager.get_mcp_logs(name, tail=tail)
-        console.print(logs)
+        # Pass the raw log chunks straight through instead of decoding them
+        sys.stdout.flush()
+        stdout_buffer = sys.stdout.buffer
+        for chunk in mcp_manager.stream_mcp_logs(name, tail=tail):
+            stdout_buffer.write(chunk)
+        stdout_buffer.flush()
 
     except Exception as e:
         console.print(f"[red]Error getting MCP logs: {e}[/red]")
@@ -1968,7 +1982,7 @@ def run_mcp_inspector(
                 mcp_name = mcp.get("name")
                 try:
                     # Get the container name for this MCP
-                    container_name = f"cubbi_mcp_{mcp_name}"
+                    container_name = MCPManager.get_mcp_container_name(mcp_name)
                     container = None
 
                     # Try to find the container
@@ -2123,7 +2137,7 @@ exec npm start
             for mcp in all_mcps:
                 if mcp.get("type") in ["docker", "proxy"]:
                     mcp_name = mcp.get("name")
-                    container_name = f"cubbi_mcp_{mcp_name}"
+                    container_name = MCPManager.get_mcp_container_name(mcp_name)
 
                     try:
                         # Check if this container exists
@@ -2203,7 +2217,9 @@ exec npm start
                         for mcp in all_mcps:
                             if mcp.get("type") in ["docker", "proxy"]:
                                 mcp_name = mcp.get("name")
-                                container_name = f"cubbi_mcp_{mcp_name}"
+                                container_name = MCPManager.get_mcp_container_name(
+                                    mcp_name
+                                )
 
                                 try:
                                     # Check if this container exists
@@ -2400,19 +2416,23 @@ def refresh_models(
         success_count = 0
         failed_providers = []
 
-        for provider_name in fetchable_providers:
-            try:
-                provider_config = user_config.get_provider(provider_name)
-                with console.status(f"Fetching models from {provider_name}..."):
-                    models = fetch_provider_models(provider_config)
+        # Write the config once after every provider has been refreshed
+        with user_config.batch():
+            for provider_name in fetchable_providers:
+                try:
+                    provider_config = user_config.get_provider(provider_name)
+                    with console.status(f"Fetching models from {provider_name}..."):
+                        models = fetch_provider_models(provider_config)
 
-                user_config.set_provider_models(provider_name, models)
-                console.print(f"[green]✓ {provider_name}: {len(models)} models[/green]")
-                success_count += 1
+                    user_config.set_provider_models(provider_name, models)
+                    console.print(
+                        f"[green]✓ {provider_name}: {len(models)} models[/green]"
+                    )
+                    success_count += 1
 
-            except Exception as e:
-                console.print(f"[red]✗ {provider_name}: {e}[/red]")
-                failed_providers.append(provider_name)
+                except Exception as e:
+                    console.print(f"[red]✗ {provider_name}: {e}[/red]")
+                    failed_providers.append(provider_name)
 
         # Summary
         console.print("\n[bold]Summary[/bold]")
@@ -2434,8 +2454,6 @@ def session_create_entry_point():
 
     All command-line options are passed through to 'session create'.
     """
-    import sys
-
     # Save the program name (e.g., 'cubbix')
     prog_name = sys.argv[0]
     # Insert 'session' and 'create' commands before any other arguments
@@ -1,16 +1,30 @@
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 import yaml
+from pydantic import TypeAdapter
 
 from .models import Config, Image
 
+try:
+    from yaml import CSafeDumper as _YamlDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as _YamlDumper
+
 DEFAULT_CONFIG_DIR = Path.home() / ".config" / "cubbi"
 DEFAULT_CONFIG_FILE = DEFAULT_CONFIG_DIR / "config.yaml"
 DEFAULT_IMAGES_DIR = Path.home() / ".config" / "cubbi" / "images"
 PROJECT_ROOT = Path(__file__).parent.parent
 BUILTIN_IMAGES_DIR = Path(__file__).parent / "images"
 
+# Shared validator for image definitions, built once per process
+_IMAGE_ADAPTER = TypeAdapter(Image)
+
+# Package images by images directory, with the (path, st_mtime_ns) of every
+# cubbi_image.yaml they were loaded from. Lets every ConfigManager created in a
+# process share one parse
+_PACKAGE_IMAGES: Dict[Path, Tuple[Tuple[Tuple[str, int], ...], Dict[str, Image]]] = {}
+
 # Dynamically loaded from images directory at runtime
 DEFAULT_IMAGES = {}
 
@@ -28,11 +42,23 @@ class ConfigManager:
         self.config_path = config_path or DEFAULT_CONFIG_FILE
         self.config_dir = self.config_path.parent
         self.images_dir = DEFAULT_IMAGES_DIR
+
+        # Lookup caches for images, cleared whenever the config is saved
+        self._image_cache: Dict[str, Optional[Image]] = {}
+        self._image_path_cache: Dict[str, Optional[Path]] = {}
+
         self.config = self._load_or_create_config()
 
-        # Always load package images on initialization
+        # Package images are loaded lazily on first access
         # These are separate from the user config
-        self.builtin_images = self._load_package_images()
+        self._builtin_images: Optional[Dict[str, Image]] = None
+
+    @property
+    def builtin_images(self) -> Dict[str, Image]:
+        """All package images, loaded from the cubbi/images directory on first use"""
+        if self._builtin_images is None:
+            self._builtin_images = self._load_package_images()
+        return self._builtin_images
 
     def _load_or_create_config(self) -> Config:
         """Load existing config or create a new one with defaults"""
@@ -50,7 +76,9 @@ class ConfigManager:
                 # Add images
                 if "images" in config_data:
                     for image_name, image_data in config_data["images"].items():
-                        config.images[image_name] = Image.model_validate(image_data)
+                        config.images[image_name] = _IMAGE_ADAPTER.validate_python(
+                            image_data
+                        )
 
                 return config
             except Exception as e:
@@ -84,18 +112,42 @@ class ConfigManager:
         if config:
             self.config = config
 
+        # User-configured images may have changed
+        self._image_cache.clear()
+        self._image_path_cache.clear()
+
         self.config_dir.mkdir(parents=True, exist_ok=True)
 
         # Use model_dump with mode="json" for proper serialization of enums
         config_dict = self.config.model_dump(mode="json")
+        data = yaml.dump(config_dict, Dumper=_YamlDumper, sort_keys=False).encode()
 
-        # Write to file
-        with open(self.config_path, "w") as f:
-            yaml.dump(config_dict, f)
+        # Skip the write if the file already holds the same content
+        try:
+            if self.config_path.read_bytes() == data:
+                return
+        except FileNotFoundError:
+            pass
+
+        self.config_path.write_bytes(data)
 
     def get_image(self, name: str) -> Optional[Image]:
         """Get an image by name, checking builtin images first, then user-configured ones"""
+        if name not in self._image_cache:
+            self._image_cache[name] = self._find_image(name)
+        return self._image_cache[name]
+
+    def _find_image(self, name: str) -> Optional[Image]:
+        """Resolve an image by name without using the lookup cache"""
         # Check builtin images first (package images take precedence)
+        if self._builtin_images is None:
+            # Image directories are named after their image, so only parse the
+            # matching cubbi_image.yaml instead of loading every package image
+            image_dir = BUILTIN_IMAGES_DIR / name
+            if (image_dir / "cubbi_image.yaml").exists():
+                image = self.load_image_from_dir(image_dir)
+                if image and image.name == name:
+                    return image
         if name in self.builtin_images:
             return self.builtin_images[name]
         # If not found, check user-configured images
@@ -133,14 +185,14 @@ class ConfigManager:
                 print(f"Image config {yaml_path} missing required fields")
                 return None
 
-            # Use Image.model_validate to handle all fields from YAML
+            # Validate with the Image model to handle all fields from YAML
             # This will map all fields according to the Image model structure
             try:
                 # Ensure image field is set if not in YAML
                 if "image" not in image_data:
                     image_data["image"] = f"monadical/cubbi-{image_data['name']}:latest"
 
-                image = Image.model_validate(image_data)
+                image = _IMAGE_ADAPTER.validate_python(image_data)
                 return image
             except Exception as validation_error:
                 print(
@@ -160,16 +212,28 @@ class ConfigManager:
             return images
 
         # Search for cubbi_image.yaml files in each subdirectory
-        for image_dir in BUILTIN_IMAGES_DIR.iterdir():
-            if image_dir.is_dir():
-                image = self.load_image_from_dir(image_dir)
-                if image:
-                    images[image.name] = image
+        yaml_paths = sorted(BUILTIN_IMAGES_DIR.glob("*/cubbi_image.yaml"))
+        version = tuple((str(path), path.stat().st_mtime_ns) for path in yaml_paths)
+        cached = _PACKAGE_IMAGES.get(BUILTIN_IMAGES_DIR)
+        if cached and cached[0] == version:
+            return dict(cached[1])
+
+        for yaml_path in yaml_paths:
+            image = self.load_image_from_dir(yaml_path.parent)
+            if image:
+                images[image.name] = image
 
-        return images
+        _PACKAGE_IMAGES[BUILTIN_IMAGES_DIR] = (version, images)
+        return dict(images)
 
     def get_image_path(self, image_name: str) -> Optional[Path]:
         """Get the directory path for an image"""
+        if image_name not in self._image_path_cache:
+            self._image_path_cache[image_name] = self._find_image_path(image_name)
+        return self._image_path_cache[image_name]
+
+    def _find_image_path(self, image_name: str) -> Optional[Path]:
+        """Resolve the directory path for an image without using the lookup cache"""
         # Check package images first (these are the bundled ones)
         package_path = BUILTIN_IMAGES_DIR / image_name
         if package_path.exists() and package_path.is_dir():
@@ -3,15 +3,20 @@ import hashlib
 import logging
 import os
 import pathlib
+import secrets
+import shutil
 import sys
 import tempfile
-import uuid
+import time
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
 import docker
 import yaml
 from docker.errors import DockerException, ImageNotFound
+from docker.models.containers import Container
+from docker.models.networks import Network
+from pydantic import TypeAdapter, ValidationError
 
 from .config import ConfigManager
 from .mcp import MCPManager
@@ -22,8 +27,42 @@ from .user_config import UserConfigManager
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Docker CLI used to attach to sessions, resolved once from PATH
+_DOCKER_BIN = shutil.which("docker")
+
+# Initialization log and status files written by cubbi_init.py in the images
+_INIT_LOG_PATH = "/cubbi/init.log"
+_INIT_STATUS_PATH = "/cubbi/init.status"
+
+# Shared serializer for persisting sessions, built once per process
+_SESSION_ADAPTER = TypeAdapter(Session)
+
+# Worker threads for parallel Docker operations when CUBBI_MAX_WORKERS is unset
+_DEFAULT_MAX_WORKERS = 32
+
+
+def _max_workers() -> int:
+    """Read the worker count from CUBBI_MAX_WORKERS, falling back to the default"""
+    value = os.environ.get("CUBBI_MAX_WORKERS")
+    if value is None:
+        return _DEFAULT_MAX_WORKERS
+    try:
+        return max(1, int(value))
+    except ValueError:
+        logger.warning(
+            f"Invalid CUBBI_MAX_WORKERS value {value!r}, using {_DEFAULT_MAX_WORKERS}"
+        )
+        return _DEFAULT_MAX_WORKERS
+
 
 class ContainerManager:
+    # Label filter matching every cubbi session container
+    _SESSION_LABEL_FILTER = {"label": "cubbi.session"}
+    # Number of container summaries requested per page when listing sessions
+    _LIST_PAGE_SIZE = 10
+    # Seconds during which a session listing is reused
+    _SESSIONS_CACHE_TTL = 2.0
+
     def __init__(
         self,
         config_manager: Optional[ConfigManager] = None,
@@ -34,26 +73,117 @@ class ContainerManager:
         self.session_manager = session_manager or SessionManager()
         self.user_config_manager = user_config_manager or UserConfigManager()
         self.mcp_manager = MCPManager(config_manager=self.user_config_manager)
+        # Worker threads for parallel Docker operations. Teardown is bound by
+        # round-trips to the Docker socket rather than CPU, so this matches the
+        # HTTP connection pool size of the client and can be tuned with
+        # CUBBI_MAX_WORKERS
+        self._max_workers = _max_workers()
 
         try:
-            self.client = docker.from_env()
-            # Test connection
-            self.client.ping()
+            # from_env() already queries the daemon to negotiate the API
+            # version, so an unreachable daemon fails here without a ping
+            self.client = docker.from_env(max_pool_size=self._max_workers)
         except DockerException as e:
             logger.error(f"Error connecting to Docker: {e}")
             print(f"Error connecting to Docker: {e}")
             sys.exit(1)
 
+        self._network_name = self.config_manager.config.docker.get(
+            "network", "cubbi-network"
+        )
+        # Networks already known to exist, by name. Networks are not expected
+        # to disappear during the lifetime of the process
+        self._known_networks: Dict[str, Network] = {}
+        # Project config directories already resolved and created, by project name
+        self._project_config_paths: Dict[str, pathlib.Path] = {}
+        # Host directories already created by this manager
+        self._ensured_dirs: Set[pathlib.Path] = set()
+        # Docker images known to be present locally, images are only removed manually
+        self._verified_images: Set[str] = set()
+        # Sessions whose initialization is known to have completed
+        self._init_complete: Set[str] = set()
+        # Last session listing with its time.monotonic() timestamp
+        self._sessions_cache: Optional[Tuple[float, List[Session]]] = None
+        # Worker threads shared by every parallel Docker operation, they are
+        # only started once work is submitted
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self._max_workers, thread_name_prefix="cubbi"
+        )
+
+    def close(self) -> None:
+        """Shut down the worker threads of the manager"""
+        self._executor.shutdown(wait=True)
+
     def _ensure_network(self) -> None:
         """Ensure the Cubbi network exists"""
-        network_name = self.config_manager.config.docker.get("network", "cubbi-network")
+        network_name = self._network_name
+        if network_name in self._known_networks:
+            return
+
         networks = self.client.networks.list(names=[network_name])
-        if not networks:
-            self.client.networks.create(network_name, driver="bridge")
+        if networks:
+            network = networks[0]
+        else:
+            network = self.client.networks.create(network_name, driver="bridge")
+        self._known_networks[network_name] = network
+
+    def _get_or_create_network(self, network_name: str) -> Network:
+        """Get a network by name, creating it if it does not exist"""
+        network = self._known_networks.get(network_name)
+        if network is None:
+            try:
+                network = self.client.networks.get(network_name)
+            except DockerException:
+                print(f"Network '{network_name}' not found, creating it...")
+                network = self.client.networks.create(network_name, driver="bridge")
+            self._known_networks[network_name] = network
+        return network
+
+    def _ensure_image(self, image_name: str) -> None:
+        """Pull a Docker image unless it is already present locally"""
+        if image_name in self._verified_images:
+            return
+
+        try:
+            self.client.images.get(image_name)
+        except ImageNotFound:
+            print(f"Pulling image {image_name}...")
+            self.client.images.pull(image_name)
+        self._verified_images.add(image_name)
+
+    def _ensure_directory(self, path: pathlib.Path) -> bool:
+        """Create a directory and its parents, once per manager
+
+        Args:
+            path: The directory to create
+
+        Returns:
+            bool: Whether the directory did not exist before
+        """
+        if path in self._ensured_dirs:
+            return False
+
+        # A single mkdir covers the common case, parents are only walked (and
+        # remembered, so sibling directories skip them) when one is missing
+        try:
+            path.mkdir()
+            created = True
+        except FileExistsError:
+            # Like mkdir(exist_ok=True), fail when the path is not a directory
+            if not path.is_dir():
+                raise
+            created = False
+        except FileNotFoundError:
+            self._ensure_directory(path.parent)
+            path.mkdir(exist_ok=True)
+            created = True
+
+        self._ensured_dirs.add(path)
+        return created
 
     def _generate_session_id(self) -> str:
         """Generate a unique session ID"""
-        return str(uuid.uuid4())[:8]
+        return secrets.token_hex(4)
 
     def _get_project_config_path(
         self, project: Optional[str] = None, project_name: Optional[str] = None
@@ -72,16 +202,28 @@ class ContainerManager:
 
         # Only use project_name if explicitly provided
         if project_name:
+            if project_name in self._project_config_paths:
+                return self._project_config_paths[project_name]
+
             # Create a hash of the project name to use as directory name
-            project_hash = hashlib.md5(project_name.encode()).hexdigest()
+            project_hash = hashlib.blake2b(
+                project_name.encode(), digest_size=16
+            ).hexdigest()
 
             # Create the project config directory path
             config_path = cubbi_home / "projects" / project_hash / "config"
 
+            # Keep using directories created with the former MD5 naming
+            if not config_path.exists():
+                legacy_hash = hashlib.md5(project_name.encode()).hexdigest()
+                legacy_path = cubbi_home / "projects" / legacy_hash / "config"
+                if legacy_path.is_dir():
+                    config_path = legacy_path
+
             # Create the directory if it doesn't exist
-            config_path.parent.mkdir(parents=True, exist_ok=True)
-            config_path.mkdir(exist_ok=True)
+            self._ensure_directory(config_path)
 
+            self._project_config_paths[project_name] = config_path
             return config_path
         else:
             # If no project_name is provided, don't create any config directory
@@ -123,8 +265,9 @@ class ContainerManager:
 
         mcps = []
         if mcp_list:
+            mcps_by_name = self.mcp_manager.get_mcps_by_name()
             for mcp_name in mcp_list:
-                mcp_config = self.mcp_manager.get_mcp(mcp_name)
+                mcp_config = mcps_by_name.get(mcp_name)
                 if mcp_config:
                     mcps.append(mcp_config)
 
@@ -171,64 +314,143 @@ class ContainerManager:
 
         return config_file
 
-    def list_sessions(self) -> List[Session]:
-        """List all active Cubbi sessions"""
-        sessions = []
-        try:
-            containers = self.client.containers.list(
-                all=True, filters={"label": "cubbi.session"}
-            )
+    @staticmethod
+    def _session_id_filter(session_id: str) -> Dict[str, str]:
+        """Label filter matching the container of a single session"""
+        return {"label": f"cubbi.session.id={session_id}"}
 
-            for container in containers:
-                container_id = container.id
-                labels = container.labels
+    def _get_container_by_session_id(self, session_id: str) -> Optional[Container]:
+        """Find the container of a session using a server-side label filter
 
-                session_id = labels.get("cubbi.session.id")
-                if not session_id:
-                    continue
+        The container is sparse, which is enough to read logs or run commands
+        by ID and saves an inspect call.
+        """
+        containers = self.client.containers.list(
+            all=True, filters=self._session_id_filter(session_id), sparse=True
+        )
+        return containers[0] if containers else None
+
+    @staticmethod
+    def _parse_port_mappings(attrs: Dict) -> Dict[int, int]:
+        """Extract {container_port: host_port} from container attributes"""
+        ports_data = attrs.get("NetworkSettings", {}).get("Ports") or {}
+        # Strip /tcp or /udp suffix and convert to int
+        return {
+            int(container_port.partition("/")[0]): int(host_ports[0]["HostPort"])
+            for container_port, host_ports in ports_data.items()
+            if host_ports
+        }
 
-                status = SessionStatus.RUNNING
-                if container.status == "exited":
-                    status = SessionStatus.STOPPED
-                elif container.status == "created":
-                    status = SessionStatus.CREATING
-
-                # Get MCP list from container labels
-                mcps_str = labels.get("cubbi.mcps", "")
-                mcps = (
-                    [mcp.strip() for mcp in mcps_str.split(",") if mcp.strip()]
-                    if mcps_str
-                    else []
-                )
+    def _session_from_summary(self, summary: Dict) -> Optional[Session]:
+        """Build a Session from a container summary of the low-level list API"""
+        labels = summary.get("Labels") or {}
 
-                session = Session(
-                    id=session_id,
-                    name=labels.get("cubbi.session.name", f"cubbi-{session_id}"),
-                    image=labels.get("cubbi.image", "unknown"),
-                    status=status,
-                    container_id=container_id,
-                    mcps=mcps,
-                )
+        session_id = labels.get("cubbi.session.id")
+        if not session_id:
+            return None
+
+        status = SessionStatus.RUNNING
+        if summary.get("State") == "exited":
+            status = SessionStatus.STOPPED
+        elif summary.get("State") == "created":
+            status = SessionStatus.CREATING
+
+        # Get MCP list from container labels
+        mcps_str = labels.get("cubbi.mcps", "")
+        mcps = (
+            [mcp.strip() for mcp in mcps_str.split(",") if mcp.strip()]
+            if mcps_str
+            else []
+        )
+
+        # Get port mappings, only published ports carry a PublicPort
+        ports = {
+            port["PrivatePort"]: port["PublicPort"]
+            for port in summary.get("Ports") or []
+            if port.get("PublicPort")
+        }
 
-                # Get port mappings
-                if container.attrs.get("NetworkSettings", {}).get("Ports"):
-                    ports = {}
-                    for container_port, host_ports in container.attrs[
-                        "NetworkSettings"
-                    ]["Ports"].items():
-                        if host_ports:
-                            # Strip /tcp or /udp suffix and convert to int
-                            container_port_num = int(container_port.split("/")[0])
-                            host_port = int(host_ports[0]["HostPort"])
-                            ports[container_port_num] = host_port
-                    session.ports = ports
-
-                sessions.append(session)
+        return Session(
+            id=session_id,
+            name=labels.get("cubbi.session.name", f"cubbi-{session_id}"),
+            image=labels.get("cubbi.image", "unknown"),
+            status=status,
+            container_id=summary["Id"],
+            ports=ports,
+            mcps=mcps,
+        )
+
+    def _find_session(self, session_id: str) -> Optional[Session]:
+        """Find a session using a server-side label filter, without inspecting"""
+        summaries = self.client.api.containers(
+            all=True, filters=self._session_id_filter(session_id)
+        )
+        return self._session_from_summary(summaries[0]) if summaries else None
+
+    def _iter_session_summaries(self) -> Iterator[Dict]:
+        """Page through the container summaries of all Cubbi sessions
+
+        Docker lists containers newest first, so each page continues before
+        the last container of the previous one. This keeps every response
+        small no matter how many sessions exist. That last container is only
+        yielded once the next page is fetched, so callers may remove the
+        containers they receive while iterating.
+        """
+        page = self.client.api.containers(
+            all=True, filters=self._SESSION_LABEL_FILTER, limit=self._LIST_PAGE_SIZE
+        )
+        seen: Set[str] = set()
+        while True:
+            if len(page) < self._LIST_PAGE_SIZE:
+                yield from page
+                return
+            yield from page[:-1]
+            anchor = page[-1]
+            seen.update(summary["Id"] for summary in page)
+            page = self.client.api.containers(
+                all=True,
+                filters={**self._SESSION_LABEL_FILTER, "before": anchor["Id"]},
+                limit=self._LIST_PAGE_SIZE,
+            )
+            yield anchor
+            # Stop if the daemon ignored the cursor and returned a page again
+            if page and page[0]["Id"] in seen:
+                return
+
+    def _stored_session(self, session_id: str) -> Optional[Session]:
+        """Load a session from the session store if it records its container"""
+        session_data = self.session_manager.get_session(session_id)
+        if not session_data or not session_data.get("container_id"):
+            return None
 
+        try:
+            return _SESSION_ADAPTER.validate_python(session_data)
+        except ValidationError:
+            return None
+
+    def list_sessions(self) -> List[Session]:
+        """List all active Cubbi sessions"""
+        # Reuse a very recent listing, it is dropped whenever this manager
+        # creates or closes a session
+        if self._sessions_cache:
+            timestamp, cached_sessions = self._sessions_cache
+            if time.monotonic() - timestamp < self._SESSIONS_CACHE_TTL:
+                return list(cached_sessions)
+
+        sessions = []
+        try:
+            # The low-level API returns labels, state and ports for every
+            # container, without one inspect per container
+            for summary in self._iter_session_summaries():
+                session = self._session_from_summary(summary)
+                if session:
+                    sessions.append(session)
+
+            self._sessions_cache = (time.monotonic(), sessions)
         except DockerException as e:
             print(f"Error listing sessions: {e}")
 
-        return sessions
+        return list(sessions)
 
     def create_session(
         self,
@@ -305,24 +527,17 @@ class ContainerManager:
             env_vars["CUBBI_CONFIG_FILE"] = "/cubbi/config.yaml"
 
             # Forward specified environment variables from the host to the container
-            if (
-                hasattr(image, "environments_to_forward")
-                and image.environments_to_forward
-            ):
-                for env_name in image.environments_to_forward:
-                    env_value = os.environ.get(env_name)
-                    if env_value is not None:
-                        env_vars[env_name] = env_value
-                        print(
-                            f"Forwarding environment variable {env_name} to container"
-                        )
+            forwarded_env = {
+                env_name: os.environ[env_name]
+                for env_name in image.environments_to_forward
+                if env_name in os.environ
+            }
+            for env_name in forwarded_env:
+                print(f"Forwarding environment variable {env_name} to container")
+            env_vars.update(forwarded_env)
 
             # Pull image if needed
-            try:
-                self.client.images.get(image.image)
-            except ImageNotFound:
-                print(f"Pulling image {image.image}...")
-                self.client.images.pull(image.image)
+            self._ensure_image(image.image)
 
             # Set up volume mounts
             session_volumes = {}
@@ -393,13 +608,11 @@ class ContainerManager:
 
                         # Create directory if it's a directory type config
                         if config.type == "directory":
-                            dir_existed = target_dir.exists()
-                            target_dir.mkdir(parents=True, exist_ok=True)
-                            if not dir_existed:
+                            if self._ensure_directory(target_dir):
                                 print(f"  - Created directory: {target_dir}")
                         # For files, make sure parent directory exists
                         elif config.type == "file":
-                            target_dir.parent.mkdir(parents=True, exist_ok=True)
+                            self._ensure_directory(target_dir.parent)
 
                         # Store persistent link data for config file
                         persistent_links.append(
@@ -419,84 +632,50 @@ class ContainerManager:
                 )
 
             # Default Cubbi network
-            default_network = self.config_manager.config.docker.get(
-                "network", "cubbi-network"
-            )
-
-            # Get network list
-            network_list = [] if no_default_network else [default_network]
+            default_network = self._network_name
 
             # Process MCPs if provided
-            mcp_configs = []
             mcp_names = []
-            mcp_container_names = []
+            container_mcp_names = []
 
             # Ensure MCP is a list
             mcps_to_process = mcp if isinstance(mcp, list) else []
 
             # Process each MCP
+            mcps_by_name = self.mcp_manager.get_mcps_by_name()
             for mcp_name in mcps_to_process:
                 # Get the MCP configuration
-                mcp_config = self.mcp_manager.get_mcp(mcp_name)
+                mcp_config = mcps_by_name.get(mcp_name)
                 if not mcp_config:
                     print(f"Warning: MCP server '{mcp_name}' not found, skipping")
                     continue
 
                 # Add to the list of processed MCPs
-                mcp_configs.append(mcp_config)
                 mcp_names.append(mcp_name)
 
-                # Check if the MCP server is running (for Docker-based MCPs)
+                # Docker-based MCPs need a running server, remote MCPs are
+                # handled by the container config
                 if mcp_config.get("type") in ["docker", "proxy"]:
-                    # Ensure the MCP is running
-                    try:
-                        print(f"Ensuring MCP server '{mcp_name}' is running...")
-                        self.mcp_manager.start_mcp(mcp_name)
+                    container_mcp_names.append(mcp_name)
 
-                        # Store container name for later network connection
-                        container_name = self.mcp_manager.get_mcp_container_name(
-                            mcp_name
-                        )
-                        mcp_container_names.append(container_name)
-
-                        # Get MCP status to extract endpoint information
-                        mcp_status = self.mcp_manager.get_mcp_status(mcp_name)
-
-                    except Exception as e:
-                        print(f"Warning: Failed to start MCP server '{mcp_name}': {e}")
-                        # Get the container name before trying to remove it from the list
-                        try:
-                            container_name = self.mcp_manager.get_mcp_container_name(
-                                mcp_name
-                            )
-                            if container_name in mcp_container_names:
-                                mcp_container_names.remove(container_name)
-                        except Exception:
-                            # If we can't get the container name, just continue
-                            pass
+            def ensure_mcp_running(mcp_name):
+                try:
+                    print(f"Ensuring MCP server '{mcp_name}' is running...")
+                    self.mcp_manager.start_mcp(mcp_name)
+                except Exception as e:
+                    print(f"Warning: Failed to start MCP server '{mcp_name}': {e}")
 
-                elif mcp_config.get("type") == "remote":
-                    # Remote MCP - nothing to do here, config will handle it
-                    pass
+            # Start the MCP servers in parallel, each start is several Docker calls
+            list(self._executor.map(ensure_mcp_running, container_mcp_names))
 
-            # Add user-specified networks
-            if no_default_network:
-                # Only use user-specified networks
-                network_list = list(networks) if networks else []
-            else:
-                # Get network list, ensuring default is first and no duplicates
-                network_list = (
-                    [default_network] + [n for n in networks if n != default_network]
-                    if networks
-                    else [default_network]
+            # Get network list with the default network first (unless disabled),
+            # followed by the user-specified networks, without duplicates
+            network_list = list(
+                dict.fromkeys(
+                    ([] if no_default_network else [default_network])
+                    + list(networks or [])
                 )
-
-            if networks:
-                for network in networks:
-                    if network not in network_list:
-                        # This check is slightly redundant now but harmless
-                        network_list.append(network)
-                        print(f"Adding network {network} to session")
+            )
 
             # Determine container command and entrypoint
             container_command = None
@@ -534,11 +713,7 @@ class ContainerManager:
 
                 # Pull network-filter image if needed
                 network_filter_image = "monadicalsas/network-filter:latest"
-                try:
-                    self.client.images.get(network_filter_image)
-                except ImageNotFound:
-                    print(f"Pulling network-filter image {network_filter_image}...")
-                    self.client.images.pull(network_filter_image)
+                self._ensure_image(network_filter_image)
 
                 # Create and start network-filter container
                 print("Creating network-filter container for domain restrictions...")
@@ -570,8 +745,6 @@ class ContainerManager:
                     )
 
                     # Wait for container to be running
-                    import time
-
                     for i in range(10):  # Wait up to 10 seconds
                         network_filter_container.reload()
                         if network_filter_container.status == "running":
@@ -665,37 +838,29 @@ class ContainerManager:
             container.start()
 
             # Connect to additional networks (after the first one in network_list)
+            # and to each MCP's dedicated network, in parallel
             # Note: Cannot connect to networks when using network_mode
-            if len(network_list) > 1 and not network_mode:
-                for network_name in network_list[1:]:
+            if not network_mode:
+
+                def connect_network(network_name):
                     try:
-                        # Get or create the network
-                        try:
-                            network = self.client.networks.get(network_name)
-                        except DockerException:
-                            print(f"Network '{network_name}' not found, creating it...")
-                            network = self.client.networks.create(
-                                network_name, driver="bridge"
-                            )
+                        network = self._get_or_create_network(network_name)
 
                         # Connect the container to the network with session name as an alias
                         network.connect(container, aliases=[session_name])
                     except DockerException as e:
                         print(f"Error connecting to network {network_name}: {e}")
 
-            # Reload the container to get updated network information
-            container.reload()
-
-            # Connect directly to each MCP's dedicated network
-            # Note: Cannot connect to networks when using network_mode
-            if not network_mode:
-                for mcp_name in mcp_names:
+                def connect_mcp_network(mcp_name):
                     try:
                         # Get the dedicated network for this MCP
                         dedicated_network_name = f"cubbi-mcp-{mcp_name}-network"
 
                         try:
-                            network = self.client.networks.get(dedicated_network_name)
+                            network = self._known_networks.get(
+                                dedicated_network_name
+                            ) or self.client.networks.get(dedicated_network_name)
+                            self._known_networks[dedicated_network_name] = network
 
                             # Connect the session container to the MCP's dedicated network
                             network.connect(container, aliases=[session_name])
@@ -713,46 +878,22 @@ class ContainerManager:
                     except Exception as e:
                         print(f"Error connecting session to MCP '{mcp_name}': {e}")
 
-            # Connect to additional user-specified networks
-            # Note: Cannot connect to networks when using network_mode
-            if networks and not network_mode:
-                for network_name in networks:
-                    # Check if already connected to this network
-                    # NetworkSettings.Networks contains a dict where keys are network names
-                    existing_networks = (
-                        container.attrs.get("NetworkSettings", {})
-                        .get("Networks", {})
-                        .keys()
-                    )
-                    if network_name not in existing_networks:
-                        try:
-                            # Get or create the network
-                            try:
-                                network = self.client.networks.get(network_name)
-                            except DockerException:
-                                print(
-                                    f"Network '{network_name}' not found, creating it..."
-                                )
-                                network = self.client.networks.create(
-                                    network_name, driver="bridge"
-                                )
-
-                            # Connect the container to the network with session name as an alias
-                            network.connect(container, aliases=[session_name])
-                        except DockerException as e:
-                            print(f"Error connecting to network {network_name}: {e}")
-
-            # Get updated port information
-            container.reload()
-            ports = {}
-            if container.attrs.get("NetworkSettings", {}).get("Ports"):
-                for container_port, host_ports in container.attrs["NetworkSettings"][
-                    "Ports"
-                ].items():
-                    if host_ports:
-                        container_port_num = int(container_port.split("/")[0])
-                        host_port = int(host_ports[0]["HostPort"])
-                        ports[container_port_num] = host_port
+                connect_futures = [
+                    self._executor.submit(connect_network, network_name)
+                    for network_name in network_list[1:]
+                ] + [
+                    self._executor.submit(connect_mcp_network, mcp_name)
+                    for mcp_name in mcp_names
+                ]
+                for future in concurrent.futures.as_completed(connect_futures):
+                    future.result()
+
+            # Host ports are bound at start and are not changed by network
+            # connects, inspect the container only if ports were published
+            port_mappings = {}
+            if ports:
+                container.reload()
+                port_mappings = self._parse_port_mappings(container.attrs)
 
             # Create session object
             session = Session(
@@ -761,14 +902,15 @@ class ContainerManager:
                 image=image_name,
                 status=SessionStatus.RUNNING,
                 container_id=container.id,
-                ports=ports,
+                ports=port_mappings,
             )
 
             # Save session to the session manager
             # Assuming Session model has uid and gid fields added to its definition
-            session_data_to_save = session.model_dump(mode="json")
+            session_data_to_save = _SESSION_ADAPTER.dump_python(session, mode="json")
             # uid and gid are already part of the model dump now
             self.session_manager.add_session(session_id, session_data_to_save)
+            self._sessions_cache = None
 
             return session
 
@@ -793,10 +935,11 @@ class ContainerManager:
             kill: If True, forcefully kill the container instead of graceful stop
         """
         try:
-            sessions = self.list_sessions()
-            for session in sessions:
-                if session.id == session_id:
-                    return self._close_single_session(session, kill=kill)
+            # The session store already knows the container, fall back to a
+            # label lookup for sessions it does not track
+            session = self._stored_session(session_id) or self._find_session(session_id)
+            if session:
+                return self._close_single_session(session, kill=kill)
 
             print(f"Session '{session_id}' not found")
             return False
@@ -813,12 +956,11 @@ class ContainerManager:
         if not session_data:
             print(f"Session '{session_id}' not found in session manager.")
             # Fallback: try listing via Docker labels if session data is missing
-            sessions = self.list_sessions()
-            session_obj = next((s for s in sessions if s.id == session_id), None)
-            if not session_obj or not session_obj.container_id:
+            container = self._get_container_by_session_id(session_id)
+            if not container:
                 print(f"Session '{session_id}' not found via Docker either.")
                 return False
-            container_id = session_obj.container_id
+            container_id = container.id
             print(
                 f"[yellow]Warning: Session data missing for {session_id}. Connecting as default container user.[/yellow]"
             )
@@ -845,6 +987,12 @@ class ContainerManager:
                 print(f"Error checking container status for session {session_id}: {e}")
                 return False
 
+        if not _DOCKER_BIN:
+            print(
+                "[red]Error: 'docker' command not found. Is Docker installed and in your PATH?[/red]"
+            )
+            return False
+
         try:
             # Use exec instead of attach to avoid container exit on Ctrl+C
             print(
@@ -857,11 +1005,14 @@ class ContainerManager:
             # which will check initialization status
             cmd = ["docker", "exec", "-it", container_id, "bash", "-l"]
 
-            # Use execvp to replace the current process with docker exec
-            # This provides a seamless shell experience
-            os.execvp("docker", cmd)
-            # execvp does not return if successful
-            return True  # Should not be reached if execvp succeeds
+            # Use execv to replace the current process with docker exec
+            # This provides a seamless shell experience. Flush first so the
+            # messages above are not lost when the process image is replaced
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.execv(_DOCKER_BIN, cmd)
+            # execv does not return if successful
+            return True  # Should not be reached if execv succeeds
 
         except FileNotFoundError:
             print(
@@ -873,6 +1024,44 @@ class ContainerManager:
             print(f"Error connecting to session: {e}")
             return False
 
+    def _stop_and_remove(
+        self, container_id: str, session_id: str, kill: bool = False
+    ) -> None:
+        """Stop and remove a session container along with its network-filter
+
+        Containers are addressed by ID or name through the low-level API, so
+        no container object has to be fetched first. The session is left in
+        the session store, callers remove it.
+
+        Args:
+            container_id: The ID of the session container
+            session_id: The ID of the session owning the container
+            kill: If True, forcefully kill the container instead of graceful stop
+
+        Raises:
+            DockerException: If the session container could not be removed
+        """
+        self._sessions_cache = None
+
+        if kill:
+            # A forced removal kills the container within the same API call
+            self.client.api.remove_container(container_id, force=True)
+        else:
+            try:
+                self.client.api.stop(container_id)
+            except DockerException:
+                pass
+            self.client.api.remove_container(container_id)
+
+        network_filter_name = f"cubbi-network-filter-{session_id}"
+        try:
+            if not kill:
+                self.client.api.stop(network_filter_name)
+            self.client.api.remove_container(network_filter_name, force=kill)
+            logger.info(f"Removed network-filter container {network_filter_name}")
+        except DockerException:
+            pass
+
     def _close_single_session(self, session: Session, kill: bool = False) -> bool:
         """Close a single session (helper for parallel processing)
 
@@ -887,35 +1076,7 @@ class ContainerManager:
             return False
 
         try:
-            container = self.client.containers.get(session.container_id)
-
-            try:
-                if kill:
-                    container.kill()
-                else:
-                    container.stop()
-            except DockerException:
-                pass
-
-            container.remove()
-
-            network_filter_name = f"cubbi-network-filter-{session.id}"
-            try:
-                network_filter_container = self.client.containers.get(
-                    network_filter_name
-                )
-                logger.info(f"Stopping network-filter container {network_filter_name}")
-                try:
-                    if kill:
-                        network_filter_container.kill()
-                    else:
-                        network_filter_container.stop()
-                except DockerException:
-                    pass
-                network_filter_container.remove()
-            except DockerException:
-                pass
-
+            self._stop_and_remove(session.container_id, session.id, kill=kill)
             self.session_manager.remove_session(session.id)
             return True
         except DockerException as e:
@@ -948,52 +1109,17 @@ class ContainerManager:
             tuple: (number of sessions closed, success)
         """
         try:
-            sessions = self.list_sessions()
-            if not sessions:
-                return 0, True
-
             # No need for session status as we receive it via callback
 
-            def close_with_progress(session):
-                if not session.container_id:
-                    return False
-
+            def close_with_progress(container_id, session_id, session_name):
                 try:
-                    container = self.client.containers.get(session.container_id)
-
-                    try:
-                        if kill:
-                            container.kill()
-                        else:
-                            container.stop()
-                    except DockerException:
-                        pass
-
-                    container.remove()
-
-                    network_filter_name = f"cubbi-network-filter-{session.id}"
-                    try:
-                        network_filter_container = self.client.containers.get(
-                            network_filter_name
-                        )
-                        try:
-                            if kill:
-                                network_filter_container.kill()
-                            else:
-                                network_filter_container.stop()
-                        except DockerException:
-                            pass
-                        network_filter_container.remove()
-                    except DockerException:
-                        pass
-
-                    self.session_manager.remove_session(session.id)
+                    self._stop_and_remove(container_id, session_id, kill=kill)
 
                     if progress_callback:
                         progress_callback(
-                            session.id,
+                            session_id,
                             "completed",
-                            f"{session.name} closed successfully",
+                            f"{session_name} closed successfully",
                         )
 
                     return True
@@ -1005,43 +1131,61 @@ class ContainerManager:
                         or "not found" in error_message
                     ):
                         print(
-                            f"Container already stopped/removed, removing session {session.id} from list"
+                            f"Container already stopped/removed, removing session {session_id} from list"
                         )
-                        self.session_manager.remove_session(session.id)
                         if progress_callback:
                             progress_callback(
-                                session.id,
+                                session_id,
                                 "completed",
-                                f"{session.name} removed from list (container already stopped)",
+                                f"{session_name} removed from list (container already stopped)",
                             )
                         return True
                     else:
                         error_msg = f"Error: {str(e)}"
                         if progress_callback:
-                            progress_callback(session.id, "failed", error_msg)
-                        print(f"Error closing session {session.id}: {e}")
+                            progress_callback(session_id, "failed", error_msg)
+                        print(f"Error closing session {session_id}: {e}")
                         return False
 
-            # Use ThreadPoolExecutor to close sessions in parallel
-            with concurrent.futures.ThreadPoolExecutor(
-                max_workers=min(10, len(sessions))
-            ) as executor:
-                # Submit all session closing tasks
-                future_to_session = {
-                    executor.submit(close_with_progress, session): session
-                    for session in sessions
-                }
+            # Start closing each session as soon as its page of the listing
+            # arrives instead of waiting for the whole listing
+            future_to_session_id = {}
+            for summary in self._iter_session_summaries():
+                labels = summary.get("Labels") or {}
+                session_id = labels.get("cubbi.session.id", summary["Id"])
+                session_name = labels.get("cubbi.session.name", f"cubbi-{session_id}")
+                future = self._executor.submit(
+                    close_with_progress, summary["Id"], session_id, session_name
+                )
+                future_to_session_id[future] = session_id
+
+            # Forget stored sessions whose container is already gone, the
+            # listing above is the only Docker call needed to find them
+            live_session_ids = set(future_to_session_id.values())
+            closed_session_ids = [
+                session_id
+                for session_id in self.session_manager.list_sessions()
+                if session_id not in live_session_ids
+            ]
+
+            if not future_to_session_id:
+                self.session_manager.remove_sessions(closed_session_ids)
+                return 0, True
 
-                # Collect results
-                closed_count = 0
-                for future in concurrent.futures.as_completed(future_to_session):
-                    session = future_to_session[future]
-                    try:
-                        success = future.result()
-                        if success:
-                            closed_count += 1
-                    except Exception as e:
-                        print(f"Error closing session {session.id}: {e}")
+            # Collect results
+            closed_count = 0
+            for future in concurrent.futures.as_completed(future_to_session_id):
+                session_id = future_to_session_id[future]
+                try:
+                    success = future.result()
+                    if success:
+                        closed_count += 1
+                        closed_session_ids.append(session_id)
+                except Exception as e:
+                    print(f"Error closing session {session_id}: {e}")
+
+            # Update the session store once for every closed session
+            self.session_manager.remove_sessions(closed_session_ids)
 
             return closed_count, closed_count > 0
 
@@ -1052,65 +1196,52 @@ class ContainerManager:
     def get_session_logs(self, session_id: str, follow: bool = False) -> Optional[str]:
         """Get logs from a Cubbi session"""
         try:
-            sessions = self.list_sessions()
-            for session in sessions:
-                if session.id == session_id and session.container_id:
-                    container = self.client.containers.get(session.container_id)
-                    if follow:
-                        # For streamed logs, we'll buffer by line to avoid character-by-character output
-                        import io
-                        from typing import Iterator
-
-                        def process_log_stream(
-                            stream: Iterator[bytes],
-                        ) -> Iterator[str]:
-                            buffer = io.StringIO()
-                            for chunk in stream:
-                                chunk_str = chunk.decode("utf-8", errors="replace")
-                                buffer.write(chunk_str)
-
-                                # Process complete lines
-                                while True:
-                                    line = buffer.getvalue()
-                                    newline_pos = line.find("\n")
-                                    if newline_pos == -1:
-                                        break
-
-                                    # Extract complete line and yield it
-                                    complete_line = line[:newline_pos].rstrip()
-                                    yield complete_line
-
-                                    # Update buffer to contain only the remaining content
-                                    new_buffer = io.StringIO()
-                                    new_buffer.write(line[newline_pos + 1 :])
-                                    buffer = new_buffer
-
-                            # Don't forget to yield any remaining content at the end
-                            final_content = buffer.getvalue().strip()
-                            if final_content:
-                                yield final_content
-
-                        try:
-                            # Process the log stream line by line
-                            for line in process_log_stream(
-                                container.logs(stream=True, follow=True)
-                            ):
-                                print(line)
-                        except KeyboardInterrupt:
-                            # Handle Ctrl+C gracefully
-                            print("\nStopped following logs.")
-
-                        return None
-                    else:
-                        return container.logs().decode()
-
-            print(f"Session '{session_id}' not found")
-            return None
+            container = self._get_container_by_session_id(session_id)
+            if not container:
+                print(f"Session '{session_id}' not found")
+                return None
+
+            if follow:
+                # Pass the raw log chunks straight through, like `docker logs -f`
+                sys.stdout.flush()
+                stdout_buffer = sys.stdout.buffer
+                try:
+                    for chunk in container.logs(stream=True, follow=True):
+                        stdout_buffer.write(chunk)
+                        stdout_buffer.flush()
+                except KeyboardInterrupt:
+                    # Handle Ctrl+C gracefully
+                    print("\nStopped following logs.")
+
+                return None
+            else:
+                return container.logs().decode()
 
         except DockerException as e:
             print(f"Error getting session logs: {e}")
             return None
 
+    def _is_init_complete(self, container: Container, session_id: str) -> bool:
+        """Check whether the initialization of a session has completed
+
+        The status file is read through the archive API instead of running a
+        process in the container, and a completed session is remembered since
+        its status never goes back.
+        """
+        if session_id in self._init_complete:
+            return True
+
+        try:
+            chunks, _ = container.get_archive(_INIT_STATUS_PATH)
+            # The tar stream is uncompressed, so the file content appears as is
+            init_complete = b"INIT_COMPLETE=true" in b"".join(chunks)
+        except DockerException:
+            return False
+
+        if init_complete:
+            self._init_complete.add(session_id)
+        return init_complete
+
     def get_init_logs(self, session_id: str, follow: bool = False) -> Optional[str]:
         """Get initialization logs from a Cubbi session
 
@@ -1122,83 +1253,50 @@ class ContainerManager:
             The logs as a string, or None if there was an error
         """
         try:
-            sessions = self.list_sessions()
-            for session in sessions:
-                if session.id == session_id and session.container_id:
-                    container = self.client.containers.get(session.container_id)
-
-                    # Check if initialization is complete
-                    init_complete = False
-                    try:
-                        exit_code, output = container.exec_run(
-                            "grep -q 'INIT_COMPLETE=true' /init.status"
-                        )
-                        init_complete = exit_code == 0
-                    except DockerException:
-                        pass
-
-                    if follow and not init_complete:
-                        print(
-                            f"Following initialization logs for session {session_id}..."
-                        )
-                        print("Press Ctrl+C to stop following")
-
-                        import io
-
-                        def process_exec_stream(stream):
-                            buffer = io.StringIO()
-                            for chunk_type, chunk_bytes in stream:
-                                if chunk_type != 1:  # Skip stderr (type 2)
-                                    continue
-
-                                chunk_str = chunk_bytes.decode(
-                                    "utf-8", errors="replace"
-                                )
-                                buffer.write(chunk_str)
-
-                                # Process complete lines
-                                while True:
-                                    line = buffer.getvalue()
-                                    newline_pos = line.find("\n")
-                                    if newline_pos == -1:
-                                        break
-
-                                    # Extract complete line and yield it
-                                    complete_line = line[:newline_pos].rstrip()
-                                    yield complete_line
-
-                                    # Update buffer to contain only the remaining content
-                                    new_buffer = io.StringIO()
-                                    new_buffer.write(line[newline_pos + 1 :])
-                                    buffer = new_buffer
-
-                            # Don't forget to yield any remaining content at the end
-                            final_content = buffer.getvalue().strip()
-                            if final_content:
-                                yield final_content
-
-                        try:
-                            exec_result = container.exec_run(
-                                "tail -f /init.log", stream=True, demux=True
-                            )
-
-                            # Process the exec stream line by line
-                            for line in process_exec_stream(exec_result[1]):
-                                print(line)
-                        except KeyboardInterrupt:
-                            print("\nStopped following logs.")
-
-                        return None
-                    else:
-                        exit_code, output = container.exec_run("cat /init.log")
-                        if exit_code == 0:
-                            return output.decode()
-                        else:
-                            print("No initialization logs found")
-                            return None
+            container = self._get_container_by_session_id(session_id)
+            if not container:
+                print(f"Session '{session_id}' not found")
+                return None
+
+            if follow and not self._is_init_complete(container, session_id):
+                print(f"Following initialization logs for session {session_id}...")
+                print("Press Ctrl+C to stop following")
+
+                # Follow the log inside the container until the status file
+                # reports completion, like init-status.sh, so the stream ends
+                # by itself instead of requiring Ctrl+C
+                follow_cmd = (
+                    f"tail -n +1 -f {_INIT_LOG_PATH} & tail_pid=$!; "
+                    f"until grep -q INIT_COMPLETE=true {_INIT_STATUS_PATH}; "
+                    "do sleep 1; done; kill $tail_pid"
+                )
+                sys.stdout.flush()
+                stdout_buffer = sys.stdout.buffer
+                try:
+                    exec_result = container.exec_run(
+                        ["sh", "-c", follow_cmd], stream=True, demux=True
+                    )
 
-            print(f"Session '{session_id}' not found")
-            return None
+                    # Pass stdout chunks straight through, skip stderr
+                    for stdout_chunk, _ in exec_result.output:
+                        if stdout_chunk:
+                            stdout_buffer.write(stdout_chunk)
+                            stdout_buffer.flush()
+                    # The stream also ends when the container stops or the exec
+                    # is killed, so completion is only remembered once the
+                    # status file confirms it
+                    self._is_init_complete(container, session_id)
+                except KeyboardInterrupt:
+                    print("\nStopped following logs.")
+
+                return None
+            else:
+                exit_code, output = container.exec_run(["cat", _INIT_LOG_PATH])
+                if exit_code == 0:
+                    return output.decode()
+                else:
+                    print("No initialization logs found")
+                    return None
 
         except DockerException as e:
             print(f"Error getting initialization logs: {e}")
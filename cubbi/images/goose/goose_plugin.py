@@ -6,6 +6,18 @@ from pathlib import Path
 from cubbi_init import ToolPlugin, cubbi_config, set_ownership
 from ruamel.yaml import YAML
 
+# Both configuration passes read and write config.yaml through the same
+# instance, so the loader and representer are only set up once
+_yaml = YAML(typ="safe")
+
+# Built-in extension enabled in every Goose configuration
+_DEVELOPER_EXTENSION = {
+    "enabled": True,
+    "name": "developer",
+    "timeout": 300,
+    "type": "builtin",
+}
+
 
 class GoosePlugin(ToolPlugin):
     @property
@@ -84,12 +96,11 @@ class GoosePlugin(ToolPlugin):
             return False
 
         config_file = config_dir / "config.yaml"
-        yaml = YAML(typ="safe")
 
         # Load or initialize configuration
         if config_file.exists():
             with config_file.open("r") as f:
-                config_data = yaml.load(f) or {}
+                config_data = _yaml.load(f) or {}
         else:
             config_data = {}
 
@@ -97,12 +108,7 @@ class GoosePlugin(ToolPlugin):
             config_data["extensions"] = {}
 
         # Add default developer extension
-        config_data["extensions"]["developer"] = {
-            "enabled": True,
-            "name": "developer",
-            "timeout": 300,
-            "type": "builtin",
-        }
+        config_data["extensions"]["developer"] = dict(_DEVELOPER_EXTENSION)
 
         # Configure Goose with the default model
         provider_config = cubbi_config.get_provider_for_default_model()
@@ -153,7 +159,7 @@ class GoosePlugin(ToolPlugin):
 
         try:
             with config_file.open("w") as f:
-                yaml.dump(config_data, f)
+                _yaml.dump(config_data, f)
 
             set_ownership(config_file)
 
@@ -177,11 +183,10 @@ class GoosePlugin(ToolPlugin):
             return False
 
         config_file = config_dir / "config.yaml"
-        yaml = YAML(typ="safe")
 
         if config_file.exists():
             with config_file.open("r") as f:
-                config_data = yaml.load(f) or {}
+                config_data = _yaml.load(f) or {}
         else:
             config_data = {"extensions": {}}
 
@@ -243,7 +248,7 @@ class GoosePlugin(ToolPlugin):
 
         try:
             with config_file.open("w") as f:
-                yaml.dump(config_data, f)
+                _yaml.dump(config_data, f)
 
             set_ownership(config_file)
 
@@ -2,13 +2,19 @@
 MCP (Model Control Protocol) server management for Cubbi Container.
 """
 
+import functools
+import hashlib
+import io
+import json
 import logging
-import os
-import tempfile
-from typing import Any, Dict, List, Optional
+import tarfile
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
 import docker
 from docker.errors import DockerException, ImageNotFound, NotFound
+from docker.models.networks import Network
 
 from .models import DockerMCP, LocalMCP, MCPContainer, MCPStatus, ProxyMCP, RemoteMCP
 from .user_config import UserConfigManager
@@ -16,6 +22,114 @@ from .user_config import UserConfigManager
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Entrypoint of the MCP proxy images: runs the base MCP image through mcp-proxy
+_PROXY_ENTRYPOINT = """#!/bin/sh
+set -x
+echo "Starting MCP proxy with base image $MCP_BASE_IMAGE (command: $MCP_COMMAND) on port $SSE_PORT"
+
+# Verify if Docker socket is available
+if [ ! -S /var/run/docker.sock ]; then
+    echo "ERROR: Docker socket not available. Cannot run base MCP image."
+    echo "Make sure the Docker socket is mounted from the host."
+
+    # Create a minimal fallback server for testing
+    cat > /tmp/fallback_server.py << 'EOF'
+import json, sys, time
+print(json.dumps({"type": "ready", "message": "Fallback server - Docker socket not available"}))
+sys.stdout.flush()
+while True:
+    line = sys.stdin.readline().strip()
+    if line:
+        try:
+            data = json.loads(line)
+            if data.get("type") == "ping":
+                print(json.dumps({"type": "pong", "id": data.get("id")}))
+            else:
+                print(json.dumps({"type": "error", "message": "Docker socket not available"}))
+        except:
+            print(json.dumps({"type": "error"}))
+        sys.stdout.flush()
+    time.sleep(1)
+EOF
+
+    exec mcp-proxy \
+      --sse-port "$SSE_PORT" \
+      --sse-host "$SSE_HOST" \
+      --allow-origin "$ALLOW_ORIGIN" \
+      --pass-environment \
+      -- \
+      python /tmp/fallback_server.py
+    exit 1
+fi
+
+# Pull the base MCP image
+echo "Pulling base MCP image: $MCP_BASE_IMAGE"
+docker pull "$MCP_BASE_IMAGE" || true
+
+# Prepare the command to run the MCP server
+if [ -n "$MCP_COMMAND" ]; then
+    CMD="$MCP_COMMAND"
+else
+    # Default to empty if no command specified
+    CMD=""
+fi
+
+echo "Running MCP server from image $MCP_BASE_IMAGE with command: $CMD"
+
+# Run the actual MCP server in the base image and pipe its I/O to mcp-proxy
+# Using docker run without -d to keep stdio connected
+
+# Build env vars string to pass through to the inner container
+ENV_ARGS=""
+
+# MCP_ENV_NAMES lists the names (no values) of the configured variables
+for var_name in $MCP_ENV_NAMES; do
+  # Simply add the env var - Docker will only pass it if it exists
+  ENV_ARGS="$ENV_ARGS -e $var_name"
+done
+
+if [ -n "$ENV_ARGS" ]; then
+  echo "Passing environment variables from MCP_ENV_NAMES: $ENV_ARGS"
+fi
+
+exec mcp-proxy \
+  --sse-port "$SSE_PORT" \
+  --sse-host "$SSE_HOST" \
+  --allow-origin "$ALLOW_ORIGIN" \
+  --pass-environment \
+  -- \
+  docker run --rm -i $ENV_ARGS "$MCP_BASE_IMAGE" $CMD
+"""
+
+# Shared base of the MCP proxy images, formatted with the proxy image
+_PROXY_BASE_DOCKERFILE = """
+FROM {proxy_image}
+
+# Install Docker CLI (trying multiple package managers to handle different base images)
+USER root
+RUN (apt-get update && apt-get install -y docker.io) || \\
+    (apt-get update && apt-get install -y docker-ce-cli) || \\
+    (apk add --no-cache docker-cli) || \\
+    (yum install -y docker) || \\
+    echo "WARNING: Could not install Docker CLI - will fall back to minimal MCP server"
+
+# Add entrypoint script
+COPY entrypoint.sh /entrypoint.sh
+RUN chmod +x /entrypoint.sh
+ENTRYPOINT ["/entrypoint.sh"]
+"""
+
+
+# Maximum number of MCP servers operated on in parallel. The shared Docker
+# client keeps as many connections, so no worker waits for or discards one
+MCP_MAX_WORKERS = 16
+
+
+@functools.lru_cache(maxsize=1)
+def _docker_client() -> docker.DockerClient:
+    """Docker client shared by every MCPManager in the process"""
+    return docker.from_env(max_pool_size=MCP_MAX_WORKERS)
+
 
 class MCPManager:
     """Manager for MCP (Model Control Protocol) servers."""
@@ -27,12 +141,80 @@ class MCPManager:
         """Initialize the MCP manager."""
         self.config_manager = config_manager or UserConfigManager()
         try:
-            self.client = docker.from_env()
-            # Test connection
-            self.client.ping()
+            self.client = _docker_client()
         except DockerException as e:
             logger.error(f"Error connecting to Docker: {e}")
             self.client = None
+        # Serializes network creation when MCP servers are started in parallel
+        self._network_lock = threading.Lock()
+        # Networks already known to exist, by name
+        self._known_networks: Dict[str, Network] = {}
+        # Proxy base images known to exist locally
+        self._proxy_base_images: Set[str] = set()
+        # Name index of the configured MCPs, with the list and length it was
+        # built from
+        self._mcp_index: Optional[
+            Tuple[List[Dict[str, Any]], int, Dict[str, Dict[str, Any]]]
+        ] = None
+
+    def _get_or_create_network(self, network_name: str) -> Network:
+        """Get a network by name, creating it if it does not exist"""
+        with self._network_lock:
+            network = self._known_networks.get(network_name)
+            if network is None:
+                networks = self.client.networks.list(names=[network_name])
+                if networks:
+                    network = networks[0]
+                else:
+                    network = self.client.networks.create(network_name, driver="bridge")
+                self._known_networks[network_name] = network
+            return network
+
+    def _ensure_proxy_base_image(self, proxy_image: str) -> str:
+        """Build the shared base image of MCP proxies unless it already exists.
+
+        The tag is derived from the proxy image and the build files, so the
+        expensive Docker CLI installation runs once per proxy image and again
+        only when the build files change.
+
+        Args:
+            proxy_image: The mcp-proxy image to build on
+
+        Returns:
+            The name of the base image
+        """
+        dockerfile_content = _PROXY_BASE_DOCKERFILE.format(proxy_image=proxy_image)
+        content_hash = hashlib.blake2b(
+            (dockerfile_content + _PROXY_ENTRYPOINT).encode(), digest_size=8
+        ).hexdigest()
+        base_image_name = f"cubbi_mcp_proxy_base:{content_hash}"
+        if base_image_name in self._proxy_base_images:
+            return base_image_name
+
+        try:
+            self.client.images.get(base_image_name)
+        except ImageNotFound:
+            # Send the build context as an in-memory tar, nothing touches disk
+            context = io.BytesIO()
+            with tarfile.open(fileobj=context, mode="w") as tar:
+                for file_name, content in (
+                    ("Dockerfile", dockerfile_content),
+                    ("entrypoint.sh", _PROXY_ENTRYPOINT),
+                ):
+                    data = content.encode()
+                    info = tarfile.TarInfo(file_name)
+                    info.size = len(data)
+                    info.mode = 0o755
+                    tar.addfile(info, io.BytesIO(data))
+            context.seek(0)
+
+            logger.info(f"Building proxy base image: {base_image_name}")
+            self.client.images.build(
+                fileobj=context, custom_context=True, tag=base_image_name, rm=True
+            )
+
+        self._proxy_base_images.add(base_image_name)
+        return base_image_name
 
     def _ensure_mcp_network(self) -> str:
         """Ensure the MCP network exists and return its name.
@@ -40,9 +222,7 @@ class MCPManager:
         """
         network_name = "cubbi-mcp-network"
         if self.client:
-            networks = self.client.networks.list(names=[network_name])
-            if not networks:
-                self.client.networks.create(network_name, driver="bridge")
+            self._get_or_create_network(network_name)
         return network_name
 
     def _get_mcp_dedicated_network(self, mcp_name: str) -> str:
@@ -56,9 +236,7 @@ class MCPManager:
         """
         network_name = f"cubbi-mcp-{mcp_name}-network"
         if self.client:
-            networks = self.client.networks.list(names=[network_name])
-            if not networks:
-                self.client.networks.create(network_name, driver="bridge")
+            self._get_or_create_network(network_name)
         return network_name
 
     def list_mcps(self) -> List[Dict[str, Any]]:
@@ -68,11 +246,57 @@ class MCPManager:
 
     def get_mcp(self, name: str) -> Optional[Dict[str, Any]]:
         """Get an MCP configuration by name."""
+        return self.get_mcps_by_name().get(name)
+
+    def get_mcps_by_name(self) -> Dict[str, Dict[str, Any]]:
+        """Get all MCP configurations indexed by name, for repeated lookups.
+
+        The index is rebuilt only when the configured list is replaced or
+        changes length, so it must not be modified by callers.
+        """
+        mcps = self.list_mcps()
+        cached = self._mcp_index
+        if cached is None or cached[0] is not mcps or cached[1] != len(mcps):
+            index = {mcp.get("name"): mcp for mcp in mcps}
+            self._mcp_index = cached = (mcps, len(mcps), index)
+        return cached[2]
+
+    def _store_mcp(
+        self, mcp_config: Dict[str, Any], add_as_default: bool
+    ) -> Dict[str, Any]:
+        """Save an MCP configuration, replacing any MCP with the same name.
+
+        Args:
+            mcp_config: The MCP configuration dictionary
+            add_as_default: Whether to add this MCP to the default MCPs list
+
+        Returns:
+            The MCP configuration dictionary
+        """
+        name = mcp_config["name"]
+
+        # Replace an existing MCP with the same name, keeping its position
         mcps = self.list_mcps()
-        for mcp in mcps:
+        for index, mcp in enumerate(mcps):
             if mcp.get("name") == name:
-                return mcp
-        return None
+                mcps[index] = mcp_config
+                break
+        else:
+            mcps.append(mcp_config)
+
+        # Save the configuration, with the defaults in the same write
+        with self.config_manager.batch():
+            self.config_manager.set("mcps", mcps)
+            self._mcp_index = None
+
+            # Add to default MCPs if requested
+            if add_as_default:
+                default_mcps = self.config_manager.get("defaults.mcps", [])
+                if name not in default_mcps:
+                    default_mcps.append(name)
+                    self.config_manager.set("defaults.mcps", default_mcps)
+
+        return mcp_config
 
     def add_remote_mcp(
         self,
@@ -101,27 +325,7 @@ class MCPManager:
             mcp_type=mcp_type,
         )
 
-        # Add to the configuration
-        mcps = self.list_mcps()
-
-        # Remove existing MCP with the same name if it exists
-        mcps = [mcp for mcp in mcps if mcp.get("name") != name]
-
-        # Add the new MCP
-        mcp_config = remote_mcp.model_dump()
-        mcps.append(mcp_config)
-
-        # Save the configuration
-        self.config_manager.set("mcps", mcps)
-
-        # Add to default MCPs if requested
-        if add_as_default:
-            default_mcps = self.config_manager.get("defaults.mcps", [])
-            if name not in default_mcps:
-                default_mcps.append(name)
-                self.config_manager.set("defaults.mcps", default_mcps)
-
-        return mcp_config
+        return self._store_mcp(remote_mcp.model_dump(), add_as_default)
 
     def add_docker_mcp(
         self,
@@ -151,27 +355,7 @@ class MCPManager:
             env=env or {},
         )
 
-        # Add to the configuration
-        mcps = self.list_mcps()
-
-        # Remove existing MCP with the same name if it exists
-        mcps = [mcp for mcp in mcps if mcp.get("name") != name]
-
-        # Add the new MCP
-        mcp_config = docker_mcp.model_dump()
-        mcps.append(mcp_config)
-
-        # Save the configuration
-        self.config_manager.set("mcps", mcps)
-
-        # Add to default MCPs if requested
-        if add_as_default:
-            default_mcps = self.config_manager.get("defaults.mcps", [])
-            if name not in default_mcps:
-                default_mcps.append(name)
-                self.config_manager.set("defaults.mcps", default_mcps)
-
-        return mcp_config
+        return self._store_mcp(docker_mcp.model_dump(), add_as_default)
 
     def add_proxy_mcp(
         self,
@@ -228,27 +412,7 @@ class MCPManager:
             host_port=host_port,
         )
 
-        # Add to the configuration
-        mcps = self.list_mcps()
-
-        # Remove existing MCP with the same name if it exists
-        mcps = [mcp for mcp in mcps if mcp.get("name") != name]
-
-        # Add the new MCP
-        mcp_config = proxy_mcp.model_dump()
-        mcps.append(mcp_config)
-
-        # Save the configuration
-        self.config_manager.set("mcps", mcps)
-
-        # Add to default MCPs if requested
-        if add_as_default:
-            default_mcps = self.config_manager.get("defaults.mcps", [])
-            if name not in default_mcps:
-                default_mcps.append(name)
-                self.config_manager.set("defaults.mcps", default_mcps)
-
-        return mcp_config
+        return self._store_mcp(proxy_mcp.model_dump(), add_as_default)
 
     def add_local_mcp(
         self,
@@ -278,27 +442,7 @@ class MCPManager:
             env=env or {},
         )
 
-        # Add to the configuration
-        mcps = self.list_mcps()
-
-        # Remove existing MCP with the same name if it exists
-        mcps = [mcp for mcp in mcps if mcp.get("name") != name]
-
-        # Add the new MCP
-        mcp_config = local_mcp.model_dump()
-        mcps.append(mcp_config)
-
-        # Save the configuration
-        self.config_manager.set("mcps", mcps)
-
-        # Add to default MCPs if requested
-        if add_as_default:
-            default_mcps = self.config_manager.get("defaults.mcps", [])
-            if name not in default_mcps:
-                default_mcps.append(name)
-                self.config_manager.set("defaults.mcps", default_mcps)
-
-        return mcp_config
+        return self._store_mcp(local_mcp.model_dump(), add_as_default)
 
     def remove_mcp(self, name: str) -> bool:
         """Remove an MCP server configuration.
@@ -309,71 +453,75 @@ class MCPManager:
         Returns:
             True if the MCP was successfully removed, False otherwise
         """
-        mcps = self.list_mcps()
+        mcp_config = self.get_mcp(name)
+        if not mcp_config:
+            return False
 
         # Filter out the MCP with the specified name
-        updated_mcps = [mcp for mcp in mcps if mcp.get("name") != name]
-
-        # If the length hasn't changed, the MCP wasn't found
-        if len(mcps) == len(updated_mcps):
-            return False
+        updated_mcps = [mcp for mcp in self.list_mcps() if mcp.get("name") != name]
 
-        # Save the updated configuration
-        self.config_manager.set("mcps", updated_mcps)
+        # Save the updated configuration, with the defaults in the same write
+        with self.config_manager.batch():
+            self.config_manager.set("mcps", updated_mcps)
 
-        # Also remove from default MCPs if it's there
-        default_mcps = self.config_manager.get("defaults.mcps", [])
-        if name in default_mcps:
-            default_mcps.remove(name)
-            self.config_manager.set("defaults.mcps", default_mcps)
+            # Also remove from default MCPs if it's there
+            default_mcps = self.config_manager.get("defaults.mcps", [])
+            if name in default_mcps:
+                default_mcps.remove(name)
+                self.config_manager.set("defaults.mcps", default_mcps)
 
-        # Stop and remove the container if it exists
-        self.stop_mcp(name)
+        # Stop and remove the container if it exists. The configuration is
+        # already gone, so this cannot go through stop_mcp
+        if mcp_config.get("type") not in ["remote", "local"]:
+            self._remove_mcp_container(name)
 
         return True
 
-    def get_mcp_container_name(self, mcp_name: str) -> str:
+    @staticmethod
+    def get_mcp_container_name(mcp_name: str) -> str:
         """Get the Docker container name for an MCP server."""
         return f"cubbi_mcp_{mcp_name}"
 
+    @staticmethod
+    def _mcp_config_hash(mcp_config: Dict[str, Any]) -> str:
+        """Hash of an MCP configuration, recorded on the containers it creates"""
+        return hashlib.blake2b(
+            json.dumps(mcp_config, sort_keys=True).encode(), digest_size=8
+        ).hexdigest()
+
     def start_mcp(self, name: str) -> Dict[str, Any]:
         """Start an MCP server container."""
-        if not self.client:
-            raise Exception("Docker client is not available")
-
         # Get the MCP configuration
         mcp_config = self.get_mcp(name)
         if not mcp_config:
             raise ValueError(f"MCP server '{name}' not found")
 
+        # Remote and Local MCP servers don't need containers, nor Docker
+        mcp_type = mcp_config.get("type")
+        if mcp_type in ["remote", "local"]:
+            return {
+                "status": "not_applicable",
+                "name": name,
+                "type": mcp_type,
+            }
+
+        if not self.client:
+            raise Exception("Docker client is not available")
+
         # Get the container name
         container_name = self.get_mcp_container_name(name)
+        config_hash = self._mcp_config_hash(mcp_config)
 
         # Check if the container already exists
         try:
             container = self.client.containers.get(container_name)
-            # Check if we need to recreate the container due to port binding changes
-            needs_recreate = False
-
-            if mcp_config.get("type") == "proxy" and mcp_config.get("host_port"):
-                # Get the current container port bindings
-                port_bindings = container.attrs.get("HostConfig", {}).get(
-                    "PortBindings", {}
-                )
-                sse_port = f"{mcp_config['proxy_options'].get('sse_port', 8080)}/tcp"
-
-                # Check if the port binding matches the configured host port
-                current_binding = port_bindings.get(sse_port, [])
-                if not current_binding or int(
-                    current_binding[0].get("HostPort", 0)
-                ) != mcp_config.get("host_port"):
-                    logger.info(
-                        f"Port binding changed for MCP '{name}', recreating container"
-                    )
-                    needs_recreate = True
-
-            # If we don't need to recreate, just start it if it's not running
-            if not needs_recreate:
+
+            # Reuse the container as long as it was created from the current
+            # configuration, otherwise recreate it to apply the changes.
+            # Containers created before the label was recorded are reused as
+            # is, so running servers used by sessions are not killed
+            container_hash = container.labels.get("cubbi.mcp.config")
+            if container_hash is None or container_hash == config_hash:
                 if container.status != "running":
                     container.start()
 
@@ -383,14 +531,9 @@ class MCPManager:
                     "status": "running",
                     "name": name,
                 }
-            else:
-                # We need to recreate the container with new port bindings
-                logger.info(
-                    f"Recreating container for MCP '{name}' with updated port bindings"
-                )
-                container.remove(force=True)
-                # Container doesn't exist, we need to create it
-                pass
+
+            logger.info(f"Configuration changed for MCP '{name}', recreating container")
+            container.remove(force=True)
         except NotFound:
             # Container doesn't exist, we need to create it
             pass
@@ -399,33 +542,9 @@ class MCPManager:
         network_name = self._ensure_mcp_network()
 
         # Handle different MCP types
-        mcp_type = mcp_config.get("type")
-
-        if mcp_type == "remote":
-            # Remote MCP servers don't need containers
-            return {
-                "status": "not_applicable",
-                "name": name,
-                "type": "remote",
-            }
-
-        elif mcp_type == "local":
-            # Local MCP servers don't need containers
-            return {
-                "status": "not_applicable",
-                "name": name,
-                "type": "local",
-            }
-
-        elif mcp_type == "docker":
-            # Pull the image if needed
-            try:
-                self.client.images.get(mcp_config["image"])
-            except ImageNotFound:
-                logger.info(f"Pulling image {mcp_config['image']}")
-                self.client.images.pull(mcp_config["image"])
-
-            # Create and start the container
+        if mcp_type == "docker":
+            # Create and start the container. containers.run() pulls the image
+            # itself when it is missing, so no lookup is needed beforehand
             container = self.client.containers.run(
                 image=mcp_config["image"],
                 command=mcp_config.get("command"),
@@ -437,11 +556,12 @@ class MCPManager:
                     "cubbi.mcp": "true",
                     "cubbi.mcp.name": name,
                     "cubbi.mcp.type": "docker",
+                    "cubbi.mcp.config": config_hash,
                 },
             )
 
             # Connect to the inspector network
-            network = self.client.networks.get(network_name)
+            network = self._get_or_create_network(network_name)
             network.connect(container, aliases=[name])
             logger.info(
                 f"Connected MCP server '{name}' to inspector network {network_name} with alias '{name}'"
@@ -449,12 +569,7 @@ class MCPManager:
 
             # Create and connect to a dedicated network for session connections
             dedicated_network_name = self._get_mcp_dedicated_network(name)
-            try:
-                dedicated_network = self.client.networks.get(dedicated_network_name)
-            except DockerException:
-                dedicated_network = self.client.networks.create(
-                    dedicated_network_name, driver="bridge"
-                )
+            dedicated_network = self._get_or_create_network(dedicated_network_name)
 
             dedicated_network.connect(container, aliases=[name])
             logger.info(
@@ -468,208 +583,81 @@ class MCPManager:
             }
 
         elif mcp_type == "proxy":
-            # For proxy, we need to create a custom Dockerfile and build an image
-            with tempfile.TemporaryDirectory() as tmp_dir:
-                # Create entrypoint script for mcp-proxy that runs the base MCP image
-                entrypoint_script = """#!/bin/sh
-set -x
-echo "Starting MCP proxy with base image $MCP_BASE_IMAGE (command: $MCP_COMMAND) on port $SSE_PORT"
-
-# Verify if Docker socket is available
-if [ ! -S /var/run/docker.sock ]; then
-    echo "ERROR: Docker socket not available. Cannot run base MCP image."
-    echo "Make sure the Docker socket is mounted from the host."
-
-    # Create a minimal fallback server for testing
-    cat > /tmp/fallback_server.py << 'EOF'
-import json, sys, time
-print(json.dumps({"type": "ready", "message": "Fallback server - Docker socket not available"}))
-sys.stdout.flush()
-while True:
-    line = sys.stdin.readline().strip()
-    if line:
-        try:
-            data = json.loads(line)
-            if data.get("type") == "ping":
-                print(json.dumps({"type": "pong", "id": data.get("id")}))
-            else:
-                print(json.dumps({"type": "error", "message": "Docker socket not available"}))
-        except:
-            print(json.dumps({"type": "error"}))
-        sys.stdout.flush()
-    time.sleep(1)
-EOF
-
-    exec mcp-proxy \
-      --sse-port "$SSE_PORT" \
-      --sse-host "$SSE_HOST" \
-      --allow-origin "$ALLOW_ORIGIN" \
-      --pass-environment \
-      -- \
-      python /tmp/fallback_server.py
-    exit 1
-fi
-
-# Pull the base MCP image
-echo "Pulling base MCP image: $MCP_BASE_IMAGE"
-docker pull "$MCP_BASE_IMAGE" || true
-
-# Prepare the command to run the MCP server
-if [ -n "$MCP_COMMAND" ]; then
-    CMD="$MCP_COMMAND"
-else
-    # Default to empty if no command specified
-    CMD=""
-fi
-
-echo "Running MCP server from image $MCP_BASE_IMAGE with command: $CMD"
-
-# Run the actual MCP server in the base image and pipe its I/O to mcp-proxy
-# Using docker run without -d to keep stdio connected
-
-# Build env vars string to pass through to the inner container
-ENV_ARGS=""
-
-# Check if the environment variable names file exists
-if [ -f "/mcp-envs.txt" ]; then
-  # Read env var names from file and pass them to docker
-  while read -r var_name; do
-    # Skip empty lines
-    if [ -n "$var_name" ]; then
-      # Simply add the env var - Docker will only pass it if it exists
-      ENV_ARGS="$ENV_ARGS -e $var_name"
-    fi
-  done < "/mcp-envs.txt"
-
-  echo "Passing environment variables from mcp-envs.txt: $ENV_ARGS"
-fi
+            # For proxy, the server runs in the shared base image, which holds
+            # the Docker CLI and the entrypoint script. Its configuration is
+            # passed as environment variables, so no per-server image is built
+            base_image_name = self._ensure_proxy_base_image(mcp_config["proxy_image"])
+            proxy_options = mcp_config["proxy_options"]
+            sse_port = proxy_options.get("sse_port", 8080)
+            command = mcp_config.get("command", "")
+            env = mcp_config.get("env", {})
+            environment = {
+                "MCP_BASE_IMAGE": mcp_config["base_image"],
+                "MCP_COMMAND": command,
+                "SSE_PORT": sse_port,
+                "SSE_HOST": proxy_options.get("sse_host", "0.0.0.0"),
+                "ALLOW_ORIGIN": proxy_options.get("allow_origin", "*"),
+                "DEBUG": 1,
+                "MCP_ENV_NAMES": " ".join(env),
+                **env,
+            }
 
-exec mcp-proxy \
-  --sse-port "$SSE_PORT" \
-  --sse-host "$SSE_HOST" \
-  --allow-origin "$ALLOW_ORIGIN" \
-  --pass-environment \
-  -- \
-  docker run --rm -i $ENV_ARGS "$MCP_BASE_IMAGE" $CMD
-"""
-                # Write the entrypoint script
-                entrypoint_path = os.path.join(tmp_dir, "entrypoint.sh")
-                with open(entrypoint_path, "w") as f:
-                    f.write(entrypoint_script)
-
-                # Create a file with environment variable names (no values)
-                env_names_path = os.path.join(tmp_dir, "mcp-envs.txt")
-                with open(env_names_path, "w") as f:
-                    # Write one env var name per line
-                    for env_name in mcp_config.get("env", {}).keys():
-                        f.write(f"{env_name}\n")
-
-                # Create a Dockerfile for the proxy
-                dockerfile_content = f"""
-FROM {mcp_config["proxy_image"]}
+            # Format command for the Docker entrypoint arguments
+            # The MCP proxy container will handle this internally based on
+            # the MCP_BASE_IMAGE and MCP_COMMAND env vars we set
+            logger.info(
+                f"Starting MCP proxy with base_image={mcp_config['base_image']}, command={command}"
+            )
 
-# Install Docker CLI (trying multiple package managers to handle different base images)
-USER root
-RUN (apt-get update && apt-get install -y docker.io) || \\
-    (apt-get update && apt-get install -y docker-ce-cli) || \\
-    (apk add --no-cache docker-cli) || \\
-    (yum install -y docker) || \\
-    echo "WARNING: Could not install Docker CLI - will fall back to minimal MCP server"
+            # Check if we need to bind to a host port
+            port_bindings = {}
+            if mcp_config.get("host_port"):
+                host_port = mcp_config.get("host_port")
+                port_bindings = {f"{sse_port}/tcp": host_port}
 
-# Set environment variables for the proxy
-ENV MCP_BASE_IMAGE={mcp_config["base_image"]}
-ENV MCP_COMMAND="{mcp_config.get("command", "")}"
-ENV SSE_PORT={mcp_config["proxy_options"].get("sse_port", 8080)}
-ENV SSE_HOST={mcp_config["proxy_options"].get("sse_host", "0.0.0.0")}
-ENV ALLOW_ORIGIN={mcp_config["proxy_options"].get("allow_origin", "*")}
-ENV DEBUG=1
+            # Create and start the container
+            container = self.client.containers.run(
+                image=base_image_name,
+                environment=environment,
+                name=container_name,
+                detach=True,
+                network=None,  # Start without network, we'll add it with aliases
+                volumes={
+                    "/var/run/docker.sock": {
+                        "bind": "/var/run/docker.sock",
+                        "mode": "rw",
+                    }
+                },
+                labels={
+                    "cubbi.mcp": "true",
+                    "cubbi.mcp.name": name,
+                    "cubbi.mcp.type": "proxy",
+                    "cubbi.mcp.config": config_hash,
+                },
+                ports=port_bindings,  # Bind the SSE port to the host if configured
+            )
 
-# Add environment variables from the configuration
-{chr(10).join([f'ENV {k}="{v}"' for k, v in mcp_config.get("env", {}).items()])}
+            # Connect to the inspector network
+            network = self._get_or_create_network(network_name)
+            network.connect(container, aliases=[name])
+            logger.info(
+                f"Connected MCP server '{name}' to inspector network {network_name} with alias '{name}'"
+            )
 
-# Add env names file and entrypoint script
-COPY mcp-envs.txt /mcp-envs.txt
-COPY entrypoint.sh /entrypoint.sh
-RUN chmod +x /entrypoint.sh
-ENTRYPOINT ["/entrypoint.sh"]
-"""
+            # Create and connect to a dedicated network for session connections
+            dedicated_network_name = self._get_mcp_dedicated_network(name)
+            dedicated_network = self._get_or_create_network(dedicated_network_name)
 
-                # Write the Dockerfile
-                dockerfile_path = os.path.join(tmp_dir, "Dockerfile")
-                with open(dockerfile_path, "w") as f:
-                    f.write(dockerfile_content)
-
-                # Build the image
-                custom_image_name = f"cubbi_mcp_proxy_{name}"
-                logger.info(f"Building custom proxy image: {custom_image_name}")
-                self.client.images.build(
-                    path=tmp_dir,
-                    tag=custom_image_name,
-                    rm=True,
-                )
-
-                # Format command for the Docker entrypoint arguments
-                # The MCP proxy container will handle this internally based on
-                # the MCP_BASE_IMAGE and MCP_COMMAND env vars we set
-                logger.info(
-                    f"Starting MCP proxy with base_image={mcp_config['base_image']}, command={mcp_config.get('command', '')}"
-                )
-
-                # Get the SSE port from the proxy options
-                sse_port = mcp_config["proxy_options"].get("sse_port", 8080)
-
-                # Check if we need to bind to a host port
-                port_bindings = {}
-                if mcp_config.get("host_port"):
-                    host_port = mcp_config.get("host_port")
-                    port_bindings = {f"{sse_port}/tcp": host_port}
-
-                # Create and start the container
-                container = self.client.containers.run(
-                    image=custom_image_name,
-                    name=container_name,
-                    detach=True,
-                    network=None,  # Start without network, we'll add it with aliases
-                    volumes={
-                        "/var/run/docker.sock": {
-                            "bind": "/var/run/docker.sock",
-                            "mode": "rw",
-                        }
-                    },
-                    labels={
-                        "cubbi.mcp": "true",
-                        "cubbi.mcp.name": name,
-                        "cubbi.mcp.type": "proxy",
-                    },
-                    ports=port_bindings,  # Bind the SSE port to the host if configured
-                )
-
-                # Connect to the inspector network
-                network = self.client.networks.get(network_name)
-                network.connect(container, aliases=[name])
-                logger.info(
-                    f"Connected MCP server '{name}' to inspector network {network_name} with alias '{name}'"
-                )
-
-                # Create and connect to a dedicated network for session connections
-                dedicated_network_name = self._get_mcp_dedicated_network(name)
-                try:
-                    dedicated_network = self.client.networks.get(dedicated_network_name)
-                except DockerException:
-                    dedicated_network = self.client.networks.create(
-                        dedicated_network_name, driver="bridge"
-                    )
-
-                dedicated_network.connect(container, aliases=[name])
-                logger.info(
-                    f"Connected MCP server '{name}' to dedicated network {dedicated_network_name} with alias '{name}'"
-                )
+            dedicated_network.connect(container, aliases=[name])
+            logger.info(
+                f"Connected MCP server '{name}' to dedicated network {dedicated_network_name} with alias '{name}'"
+            )
 
-                return {
-                    "container_id": container.id,
-                    "status": "running",
-                    "name": name,
-                }
+            return {
+                "container_id": container.id,
+                "status": "running",
+                "name": name,
+            }
 
         else:
             raise ValueError(f"Unsupported MCP type: {mcp_type}")
@@ -683,10 +671,6 @@ ENTRYPOINT ["/entrypoint.sh"]
         Returns:
             True if the operation was successful (including cases where the container doesn't exist)
         """
-        if not self.client:
-            logger.warning("Docker client is not available")
-            return False
-
         # Get the MCP configuration - don't raise an exception if not found
         mcp_config = self.get_mcp(name)
         if not mcp_config:
@@ -699,21 +683,33 @@ ENTRYPOINT ["/entrypoint.sh"]
         if mcp_config.get("type") in ["remote", "local"]:
             return True
 
+        return self._remove_mcp_container(name)
+
+    def _remove_mcp_container(self, name: str) -> bool:
+        """Stop and remove the container of an MCP server, if it exists.
+
+        Args:
+            name: The name of the MCP server
+
+        Returns:
+            False if Docker is not available, True otherwise
+        """
+        if not self.client:
+            logger.warning("Docker client is not available")
+            return False
+
         # Get the container name
         container_name = self.get_mcp_container_name(name)
 
-        # Try to get, stop, and remove the container
+        # Stop and remove the container by name, without inspecting it first.
+        # Stopping a container that is not running is a no-op for Docker
         try:
-            container = self.client.containers.get(container_name)
-
-            # Stop the container if it's running
-            if container.status == "running":
-                logger.info(f"Stopping MCP container '{name}'...")
-                container.stop(timeout=10)
+            logger.info(f"Stopping MCP container '{name}'...")
+            self.client.api.stop(container_name, timeout=10)
 
             # Remove the container regardless of its status
             logger.info(f"Removing MCP container '{name}'...")
-            container.remove(force=True)
+            self.client.api.remove_container(container_name, force=True)
             return True
 
         except NotFound:
@@ -727,9 +723,6 @@ ENTRYPOINT ["/entrypoint.sh"]
 
     def restart_mcp(self, name: str) -> Dict[str, Any]:
         """Restart an MCP server container."""
-        if not self.client:
-            raise Exception("Docker client is not available")
-
         # Get the MCP configuration
         mcp_config = self.get_mcp(name)
         if not mcp_config:
@@ -743,6 +736,9 @@ ENTRYPOINT ["/entrypoint.sh"]
                 "type": mcp_config.get("type"),
             }
 
+        if not self.client:
+            raise Exception("Docker client is not available")
+
         # Get the container name
         container_name = self.get_mcp_container_name(name)
 
@@ -762,17 +758,35 @@ ENTRYPOINT ["/entrypoint.sh"]
             logger.error(f"Error restarting MCP container: {e}")
             raise
 
-    def get_mcp_status(self, name: str) -> Dict[str, Any]:
-        """Get the status of an MCP server."""
-        if not self.client:
-            raise Exception("Docker client is not available")
-
-        # Get the MCP configuration
-        mcp_config = self.get_mcp(name)
-        if not mcp_config:
-            raise ValueError(f"MCP server '{name}' not found")
-
-        # Remote MCPs don't have containers
+    @staticmethod
+    def _parse_container_ports(attrs: Dict[str, Any]) -> Dict[str, Optional[int]]:
+        """Map every exposed port ("8080/tcp") to its host port, or None if unbound"""
+        # All exposed ports, overridden by the host port of published ones
+        ports = dict.fromkeys(attrs.get("Config", {}).get("ExposedPorts") or {})
+        for port, mappings in (
+            attrs.get("NetworkSettings", {}).get("Ports") or {}
+        ).items():
+            if mappings:
+                ports[port] = int(mappings[0]["HostPort"])
+        return ports
+
+    @staticmethod
+    def _parse_summary_ports(summary: Dict[str, Any]) -> Dict[str, Optional[int]]:
+        """Same mapping as _parse_container_ports, from a container list summary"""
+        ports: Dict[str, Optional[int]] = {}
+        for mapping in summary.get("Ports") or []:
+            port = f"{mapping['PrivatePort']}/{mapping['Type']}"
+            if mapping.get("PublicPort"):
+                ports[port] = mapping["PublicPort"]
+            else:
+                ports.setdefault(port, None)
+        return ports
+
+    @staticmethod
+    def _containerless_status(
+        name: str, mcp_config: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Status of a remote or local MCP, or None for container-based MCPs"""
         if mcp_config.get("type") == "remote":
             return {
                 "status": "not_applicable",
@@ -781,7 +795,6 @@ ENTRYPOINT ["/entrypoint.sh"]
                 "url": mcp_config.get("url"),
             }
 
-        # Local MCPs don't have containers
         if mcp_config.get("type") == "local":
             return {
                 "status": "not_applicable",
@@ -791,6 +804,84 @@ ENTRYPOINT ["/entrypoint.sh"]
                 "args": mcp_config.get("args", []),
             }
 
+        return None
+
+    def get_all_mcp_statuses(self) -> Dict[str, Dict[str, Any]]:
+        """Get the status of every configured MCP server, by name.
+
+        Uses a single container listing instead of one lookup per MCP server.
+        The status dictionaries have the same shape as those of get_mcp_status.
+        """
+        if not self.client:
+            raise Exception("Docker client is not available")
+
+        try:
+            summaries = self.client.api.containers(
+                all=True, filters={"label": "cubbi.mcp"}
+            )
+            error = None
+        except DockerException as e:
+            logger.error(f"Error listing MCP containers: {e}")
+            summaries = []
+            error = str(e)
+
+        summaries_by_name = {
+            (summary.get("Labels") or {}).get("cubbi.mcp.name"): summary
+            for summary in summaries
+        }
+
+        statuses = {}
+        for mcp_config in self.list_mcps():
+            name = mcp_config.get("name", "")
+            status = self._containerless_status(name, mcp_config)
+            if status:
+                statuses[name] = status
+                continue
+
+            summary = summaries_by_name.get(name)
+            if error:
+                statuses[name] = {
+                    "status": MCPStatus.FAILED,
+                    "name": name,
+                    "error": error,
+                }
+            elif summary is None:
+                statuses[name] = {
+                    "status": MCPStatus.NOT_FOUND,
+                    "name": name,
+                    "type": mcp_config.get("type"),
+                }
+            else:
+                running = summary.get("State") == "running"
+                statuses[name] = {
+                    "status": MCPStatus.RUNNING if running else MCPStatus.STOPPED,
+                    "container_id": summary["Id"],
+                    "name": name,
+                    "type": mcp_config.get("type"),
+                    "image": summary["Image"],
+                    "ports": self._parse_summary_ports(summary),
+                    "created": datetime.fromtimestamp(
+                        summary["Created"], tz=timezone.utc
+                    ).isoformat(),
+                }
+
+        return statuses
+
+    def get_mcp_status(self, name: str) -> Dict[str, Any]:
+        """Get the status of an MCP server."""
+        if not self.client:
+            raise Exception("Docker client is not available")
+
+        # Get the MCP configuration
+        mcp_config = self.get_mcp(name)
+        if not mcp_config:
+            raise ValueError(f"MCP server '{name}' not found")
+
+        # Remote and Local MCPs don't have containers
+        status = self._containerless_status(name, mcp_config)
+        if status:
+            return status
+
         # Get the container name
         container_name = self.get_mcp_container_name(name)
 
@@ -806,30 +897,10 @@ ENTRYPOINT ["/entrypoint.sh"]
             # Get container details
             container_info = container.attrs
 
-            # Extract exposed ports from config
-            ports = {}
-            if (
-                "Config" in container_info
-                and "ExposedPorts" in container_info["Config"]
-            ):
-                # Add all exposed ports
-                for port in container_info["Config"]["ExposedPorts"].keys():
-                    ports[port] = None
-
-            # Add any ports that might be published
-            if (
-                "NetworkSettings" in container_info
-                and "Ports" in container_info["NetworkSettings"]
-            ):
-                for port, mappings in container_info["NetworkSettings"][
-                    "Ports"
-                ].items():
-                    if mappings:
-                        # Port is bound to host
-                        ports[port] = int(mappings[0]["HostPort"])
+            ports = self._parse_container_ports(container_info)
 
             return {
-                "status": status.value,
+                "status": status,
                 "container_id": container.id,
                 "name": name,
                 "type": mcp_config.get("type"),
@@ -840,20 +911,28 @@ ENTRYPOINT ["/entrypoint.sh"]
         except NotFound:
             # Container doesn't exist
             return {
-                "status": MCPStatus.NOT_FOUND.value,
+                "status": MCPStatus.NOT_FOUND,
                 "name": name,
                 "type": mcp_config.get("type"),
             }
         except Exception as e:
             logger.error(f"Error getting MCP container status: {e}")
             return {
-                "status": MCPStatus.FAILED.value,
+                "status": MCPStatus.FAILED,
                 "name": name,
                 "error": str(e),
             }
 
     def get_mcp_logs(self, name: str, tail: int = 100) -> str:
         """Get logs from an MCP server container."""
+        return b"".join(self.stream_mcp_logs(name, tail=tail)).decode("utf-8")
+
+    def stream_mcp_logs(self, name: str, tail: int = 100) -> Iterator[bytes]:
+        """Stream logs from an MCP server container as raw byte chunks.
+
+        Messages explaining why there are no logs are yielded the same way,
+        as a single newline-terminated line.
+        """
         if not self.client:
             raise Exception("Docker client is not available")
 
@@ -864,80 +943,57 @@ ENTRYPOINT ["/entrypoint.sh"]
 
         # Remote and Local MCPs don't have logs
         if mcp_config.get("type") == "remote":
-            return "Remote MCPs don't have local logs"
+            yield b"Remote MCPs don't have local logs\n"
+            return
         if mcp_config.get("type") == "local":
-            return "Local MCPs don't have container logs"
+            yield b"Local MCPs don't have container logs\n"
+            return
 
         # Get the container name
         container_name = self.get_mcp_container_name(name)
 
-        # Try to get the container logs
+        # Read the logs by container name, without inspecting it first
         try:
-            container = self.client.containers.get(container_name)
-            logs = container.logs(tail=tail, timestamps=True).decode("utf-8")
-            return logs
+            yield from self.client.api.logs(
+                container_name, tail=tail, timestamps=True, stream=True
+            )
         except NotFound:
             # Container doesn't exist
-            return f"MCP container '{name}' not found"
+            yield f"MCP container '{name}' not found\n".encode()
         except Exception as e:
             logger.error(f"Error getting MCP container logs: {e}")
-            return f"Error getting logs: {str(e)}"
+            yield f"Error getting logs: {str(e)}\n".encode()
 
     def list_mcp_containers(self) -> List[MCPContainer]:
         """List all MCP containers."""
         if not self.client:
             raise Exception("Docker client is not available")
 
-        # Get all containers with the cubbi.mcp label
-        containers = self.client.containers.list(
-            all=True, filters={"label": "cubbi.mcp"}
-        )
+        # Container summaries from the list call carry everything needed here,
+        # which avoids one inspect call per container
+        summaries = self.client.api.containers(all=True, filters={"label": "cubbi.mcp"})
 
         result = []
-        for container in containers:
-            # Get container details
-            container_info = container.attrs
-
-            # Extract labels
-            labels = container_info["Config"]["Labels"]
-
-            # Extract exposed ports from config
-            ports = {}
-            if (
-                "Config" in container_info
-                and "ExposedPorts" in container_info["Config"]
-            ):
-                # Add all exposed ports
-                for port in container_info["Config"]["ExposedPorts"].keys():
-                    ports[port] = None
-
-            # Add any ports that might be published
-            if (
-                "NetworkSettings" in container_info
-                and "Ports" in container_info["NetworkSettings"]
-            ):
-                for port, mappings in container_info["NetworkSettings"][
-                    "Ports"
-                ].items():
-                    if mappings:
-                        # Port is bound to host
-                        ports[port] = int(mappings[0]["HostPort"])
+        for summary in summaries:
+            labels = summary.get("Labels") or {}
 
             # Determine status
             status = (
                 MCPStatus.RUNNING
-                if container.status == "running"
+                if summary.get("State") == "running"
                 else MCPStatus.STOPPED
             )
 
             # Create MCPContainer object
             mcp_container = MCPContainer(
                 name=labels.get("cubbi.mcp.name", "unknown"),
-                container_id=container.id,
+                container_id=summary["Id"],
                 status=status,
-                image=container_info["Config"]["Image"],
-                ports=ports,
-                created_at=container_info["Created"],
+                image=summary["Image"],
+                ports=self._parse_summary_ports(summary),
+                created_at=datetime.fromtimestamp(
+                    summary["Created"], tz=timezone.utc
+                ).isoformat(),
                 type=labels.get("cubbi.mcp.type", "unknown"),
             )
 
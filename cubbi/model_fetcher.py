@@ -4,10 +4,13 @@ Model fetching utilities for OpenAI-compatible providers.
 
 import json
 import logging
+import os
 from typing import Dict, List, Optional
 
 import requests
 
+from .config import PROVIDER_DEFAULT_URLS
+
 logger = logging.getLogger(__name__)
 
 
@@ -214,9 +217,6 @@ def fetch_provider_models(
         ValueError: If provider is not supported or missing required fields
         requests.RequestException: If the request fails
     """
-    import os
-    from .config import PROVIDER_DEFAULT_URLS
-
     provider_type = provider_config.get("type", "")
     base_url = provider_config.get("base_url")
     api_key = provider_config.get("api_key", "")
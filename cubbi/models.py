@@ -1,24 +1,30 @@
-from enum import Enum
+from dataclasses import dataclass, field
+from enum import StrEnum
 from typing import Any, Dict, List, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
-class SessionStatus(str, Enum):
+class SessionStatus(StrEnum):
     CREATING = "creating"
     RUNNING = "running"
     STOPPED = "stopped"
     FAILED = "failed"
 
 
-class MCPStatus(str, Enum):
+class MCPStatus(StrEnum):
     RUNNING = "running"
     STOPPED = "stopped"
     NOT_FOUND = "not_found"
     FAILED = "failed"
 
 
+# Image and MCP definitions are read-only once loaded, so they are frozen
+
+
 class ImageEnvironmentVariable(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     name: str
     description: str
     required: bool = False
@@ -27,6 +33,8 @@ class ImageEnvironmentVariable(BaseModel):
 
 
 class PersistentConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     source: str
     target: str
     type: str  # "directory" or "file"
@@ -34,6 +42,8 @@ class PersistentConfig(BaseModel):
 
 
 class Image(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     name: str
     description: str
     version: str
@@ -45,6 +55,8 @@ class Image(BaseModel):
 
 
 class RemoteMCP(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     name: str
     type: str = "remote"
     url: str
@@ -53,6 +65,8 @@ class RemoteMCP(BaseModel):
 
 
 class DockerMCP(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     name: str
     type: str = "docker"
     image: str
@@ -61,6 +75,8 @@ class DockerMCP(BaseModel):
 
 
 class ProxyMCP(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     name: str
     type: str = "proxy"
     base_image: str
@@ -72,6 +88,8 @@ class ProxyMCP(BaseModel):
 
 
 class LocalMCP(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     name: str
     type: str = "local"
     command: str  # Path to executable
@@ -82,24 +100,31 @@ class LocalMCP(BaseModel):
 MCP = Union[RemoteMCP, DockerMCP, ProxyMCP, LocalMCP]
 
 
-class MCPContainer(BaseModel):
+# Containers and sessions are built from Docker responses on every listing, so
+# they are plain dataclasses. Stored sessions are still validated, through a
+# pydantic TypeAdapter
+
+
+@dataclass(slots=True)
+class MCPContainer:
     name: str
     container_id: str
     status: MCPStatus
     image: str
-    ports: Dict[str, Optional[int]] = Field(default_factory=dict)
     created_at: str
     type: str
+    ports: Dict[str, Optional[int]] = field(default_factory=dict)
 
 
-class Session(BaseModel):
+@dataclass(slots=True)
+class Session:
     id: str
     name: str
     image: str
     status: SessionStatus
     container_id: Optional[str] = None
-    ports: Dict[int, int] = Field(default_factory=dict)
-    mcps: List[str] = Field(default_factory=list)
+    ports: Dict[int, int] = field(default_factory=dict)
+    mcps: List[str] = field(default_factory=list)
 
 
 class Config(BaseModel):
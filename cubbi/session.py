@@ -6,10 +6,17 @@ import fcntl
 import os
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional
 
 import yaml
 
+try:
+    from yaml import CSafeDumper as _YamlDumper
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as _YamlDumper
+    from yaml import SafeLoader as _YamlLoader
+
 DEFAULT_SESSIONS_FILE = Path.home() / ".config" / "cubbi" / "sessions.yaml"
 
 
@@ -58,14 +65,14 @@ class SessionManager:
             self.sessions_path.parent.mkdir(parents=True, exist_ok=True)
             # Create empty sessions file
             with open(self.sessions_path, "w") as f:
-                yaml.safe_dump({}, f)
+                yaml.dump({}, f, Dumper=_YamlDumper)
             # Set secure permissions
             os.chmod(self.sessions_path, 0o600)
             return {}
 
         # Load existing sessions
         with open(self.sessions_path, "r") as f:
-            sessions = yaml.safe_load(f) or {}
+            sessions = yaml.load(f, Loader=_YamlLoader) or {}
         return sessions
 
     def save(self) -> None:
@@ -77,7 +84,7 @@ class SessionManager:
         with _file_lock(self.sessions_path) as fd:
             # Reload sessions from disk to get latest state
             fd.seek(0)
-            sessions = yaml.safe_load(fd) or {}
+            sessions = yaml.load(fd, Loader=_YamlLoader) or {}
 
             # Merge current in-memory sessions with disk state
             sessions.update(self.sessions)
@@ -85,7 +92,7 @@ class SessionManager:
             # Write back to file
             fd.seek(0)
             fd.truncate()
-            yaml.safe_dump(sessions, fd)
+            yaml.dump(sessions, fd, Dumper=_YamlDumper)
 
             # Update in-memory cache
             self.sessions = sessions
@@ -100,7 +107,7 @@ class SessionManager:
         with _file_lock(self.sessions_path) as fd:
             # Reload sessions from disk to get latest state
             fd.seek(0)
-            sessions = yaml.safe_load(fd) or {}
+            sessions = yaml.load(fd, Loader=_YamlLoader) or {}
 
             # Apply the modification
             sessions[session_id] = session_data
@@ -108,7 +115,7 @@ class SessionManager:
             # Write back to file
             fd.seek(0)
             fd.truncate()
-            yaml.safe_dump(sessions, fd)
+            yaml.dump(sessions, fd, Dumper=_YamlDumper)
 
             # Update in-memory cache
             self.sessions = sessions
@@ -138,19 +145,33 @@ class SessionManager:
         Args:
             session_id: The session ID to remove
         """
+        self.remove_sessions([session_id])
+
+    def remove_sessions(self, session_ids: Iterable[str]) -> None:
+        """Remove several sessions from storage with a single write.
+
+        Args:
+            session_ids: The session IDs to remove
+        """
+        session_ids = set(session_ids)
+        if not session_ids:
+            return
+
         with _file_lock(self.sessions_path) as fd:
             # Reload sessions from disk to get latest state
             fd.seek(0)
-            sessions = yaml.safe_load(fd) or {}
+            sessions = yaml.load(fd, Loader=_YamlLoader) or {}
 
             # Apply the modification
-            if session_id in sessions:
-                del sessions[session_id]
+            removed = session_ids & sessions.keys()
+            if removed:
+                for session_id in removed:
+                    del sessions[session_id]
 
                 # Write back to file
                 fd.seek(0)
                 fd.truncate()
-                yaml.safe_dump(sessions, fd)
+                yaml.dump(sessions, fd, Dumper=_YamlDumper)
 
             # Update in-memory cache
             self.sessions = sessions
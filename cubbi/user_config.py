@@ -2,12 +2,26 @@
 User configuration manager for Cubbi Container Tool.
 """
 
+import copy
+import functools
 import os
+import re
+import shutil
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import yaml
 
+from .config import PROVIDER_DEFAULT_URLS
+
+try:
+    from yaml import CSafeDumper as _YamlDumper
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as _YamlDumper
+    from yaml import SafeLoader as _YamlLoader
+
 # Define the environment variable mappings for auto-discovery
 STANDARD_PROVIDERS = {
     "anthropic": {
@@ -41,6 +55,104 @@ LEGACY_ENV_MAPPINGS = {
 }
 
 
+# Default configuration, copied for each new or reset config
+_DEFAULT_CONFIG: Dict[str, Any] = {
+    "defaults": {
+        "image": "goose",
+        "connect": True,
+        "mount_local": True,
+        "networks": [],  # Default networks to connect to (besides cubbi-network)
+        "volumes": [],  # Default volumes to mount, format: "source:dest"
+        "ports": [],  # Default ports to forward, format: list of integers
+        "mcps": [],  # Default MCP servers to connect to
+        "model": "anthropic/claude-3-5-sonnet-latest",  # Default LLM model (provider/model format)
+    },
+    "providers": {},  # LLM providers configuration
+    "services": {
+        "langfuse": {},  # Keep langfuse in services as it's not an LLM provider
+    },
+    "docker": {
+        "network": "cubbi-network",
+    },
+    "ui": {
+        "colors": True,
+        "verbose": False,
+    },
+}
+
+
+def _flatten_defaults(defaults: Dict[str, Any]) -> List[Tuple[Tuple[str, ...], Any]]:
+    """List the (path, value) leaves of a defaults tree, empty dicts included"""
+    leaves = []
+    stack = [((key,), value) for key, value in reversed(defaults.items())]
+    while stack:
+        path, value = stack.pop()
+        if isinstance(value, dict) and value:
+            stack.extend(((*path, k), v) for k, v in reversed(value.items()))
+        else:
+            leaves.append((path, value))
+    return leaves
+
+
+# Default leaves that _merge_with_defaults fills in when missing
+_DEFAULT_LEAVES = _flatten_defaults(_DEFAULT_CONFIG)
+
+
+# (service, setting) -> variable table for the legacy mappings that are still
+# forwarded. API keys are left to the cubbi_init plugins
+_SERVICE_ENV_TABLE = {
+    tuple(config_path.split(".")[1:]): env_var
+    for config_path, env_var in LEGACY_ENV_MAPPINGS.items()
+    if "API_KEY" not in env_var and "SECRET_KEY" not in env_var
+}
+
+# A "${VAR}" reference to a host environment variable
+_ENV_REF_RE = re.compile(r"\$\{([^}]+)\}")
+
+
+# Top-level sections addressed by full path; any other dotted key is
+# shorthand for a service setting ("langfuse.url" -> "services.langfuse.url")
+_KNOWN_PREFIXES = (
+    "services.",
+    "defaults.",
+    "docker.",
+    "remote.",
+    "ui.",
+    "providers.",
+)
+
+# Key fragments whose values list_config masks
+_SENSITIVE_RE = re.compile("key|token|secret|password", re.IGNORECASE)
+
+
+# Parsed configuration files, by path, with the (st_mtime_ns, st_size) they
+# were read at. Lets every manager created in a process share one parse
+_PARSED_CONFIGS: Dict[Path, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
+
+def _read_config_file(path: Path) -> Dict[str, Any]:
+    """Parse a YAML configuration file, reusing the last parse if unchanged"""
+    stat = path.stat()
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _PARSED_CONFIGS.get(path)
+    if cached and cached[0] == version:
+        return copy.deepcopy(cached[1])
+
+    with open(path, "r") as f:
+        config = yaml.load(f, Loader=_YamlLoader) or {}
+    _PARSED_CONFIGS[path] = (version, copy.deepcopy(config))
+    return config
+
+
+@functools.lru_cache(maxsize=256)
+def _key_parts(key_path: str) -> Tuple[str, ...]:
+    """Split a dot-notation key into its path, expanding service shorthand"""
+    parts = tuple(key_path.split("."))
+    if len(parts) > 1 and not key_path.startswith(_KNOWN_PREFIXES):
+        return ("services", *parts)
+    return parts
+
+
 class UserConfigManager:
     """Manager for user-specific configuration."""
 
@@ -56,6 +168,9 @@ class UserConfigManager:
             config_path or os.path.expanduser("~/.config/cubbi/config.yaml")
         )
         self.config = self._load_config()
+        # Nesting depth of batch() blocks, and whether a save was deferred
+        self._batch_depth = 0
+        self._save_pending = False
 
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from file or create with defaults if it doesn't exist."""
@@ -70,15 +185,14 @@ class UserConfigManager:
 
             # Save to file
             with open(self.config_path, "w") as f:
-                yaml.safe_dump(default_config, f)
+                yaml.dump(default_config, f, Dumper=_YamlDumper)
             # Set secure permissions
             os.chmod(self.config_path, 0o600)
             return default_config
 
         # Load existing config with error handling
         try:
-            with open(self.config_path, "r") as f:
-                config = yaml.safe_load(f) or {}
+            config = _read_config_file(self.config_path)
 
             # Check for backup file that might be newer
             backup_path = self.config_path.with_suffix(".yaml.bak")
@@ -87,7 +201,7 @@ class UserConfigManager:
                 if backup_path.stat().st_mtime > self.config_path.stat().st_mtime:
                     try:
                         with open(backup_path, "r") as f:
-                            backup_config = yaml.safe_load(f) or {}
+                            backup_config = yaml.load(f, Loader=_YamlLoader) or {}
                         print("Found newer backup config, using that instead")
                         config = backup_config
                     except Exception as e:
@@ -100,7 +214,7 @@ class UserConfigManager:
             if backup_path.exists():
                 try:
                     with open(backup_path, "r") as f:
-                        config = yaml.safe_load(f) or {}
+                        config = yaml.load(f, Loader=_YamlLoader) or {}
                     print("Loaded configuration from backup file")
                 except Exception as backup_e:
                     print(f"Failed to load backup configuration: {backup_e}")
@@ -118,44 +232,21 @@ class UserConfigManager:
 
     def _get_default_config(self) -> Dict[str, Any]:
         """Get the default configuration."""
-        return {
-            "defaults": {
-                "image": "goose",
-                "connect": True,
-                "mount_local": True,
-                "networks": [],  # Default networks to connect to (besides cubbi-network)
-                "volumes": [],  # Default volumes to mount, format: "source:dest"
-                "ports": [],  # Default ports to forward, format: list of integers
-                "mcps": [],  # Default MCP servers to connect to
-                "model": "anthropic/claude-3-5-sonnet-latest",  # Default LLM model (provider/model format)
-            },
-            "providers": {},  # LLM providers configuration
-            "services": {
-                "langfuse": {},  # Keep langfuse in services as it's not an LLM provider
-            },
-            "docker": {
-                "network": "cubbi-network",
-            },
-            "ui": {
-                "colors": True,
-                "verbose": False,
-            },
-        }
+        return copy.deepcopy(_DEFAULT_CONFIG)
 
     def _merge_with_defaults(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """Merge user config with defaults for missing values."""
-        defaults = self._get_default_config()
-
-        # Deep merge of config with defaults
-        def _deep_merge(source, destination):
-            for key, value in source.items():
-                if key not in destination:
-                    destination[key] = value
-                elif isinstance(value, dict) and isinstance(destination[key], dict):
-                    _deep_merge(value, destination[key])
-            return destination
+        for path, value in _DEFAULT_LEAVES:
+            destination = config
+            for key in path[:-1]:
+                destination = destination.setdefault(key, {})
+                if not isinstance(destination, dict):
+                    break
+            else:
+                if path[-1] not in destination:
+                    destination[path[-1]] = copy.copy(value)
 
-        return _deep_merge(defaults, config)
+        return config
 
     def get(self, key_path: str, default: Any = None) -> Any:
         """Get a configuration value by dot-notation path.
@@ -168,18 +259,7 @@ class UserConfigManager:
             The configuration value or default if not found
         """
         # Handle shorthand service paths (e.g., "langfuse.url")
-        if (
-            "." in key_path
-            and not key_path.startswith("services.")
-            and not any(
-                key_path.startswith(section + ".")
-                for section in ["defaults", "docker", "remote", "ui", "providers"]
-            )
-        ):
-            service, setting = key_path.split(".", 1)
-            key_path = f"services.{service}.{setting}"
-
-        parts = key_path.split(".")
+        parts = _key_parts(key_path)
         result = self.config
 
         for part in parts:
@@ -197,18 +277,7 @@ class UserConfigManager:
             value: The value to set
         """
         # Handle shorthand service paths (e.g., "langfuse.url")
-        if (
-            "." in key_path
-            and not key_path.startswith("services.")
-            and not any(
-                key_path.startswith(section + ".")
-                for section in ["defaults", "docker", "remote", "ui", "providers"]
-            )
-        ):
-            service, setting = key_path.split(".", 1)
-            key_path = f"services.{service}.{setting}"
-
-        parts = key_path.split(".")
+        parts = _key_parts(key_path)
         config = self.config
 
         # Navigate to the containing dictionary
@@ -217,18 +286,57 @@ class UserConfigManager:
                 config[part] = {}
             config = config[part]
 
+        # Nothing to write if the value is unchanged. A list or dict that the
+        # caller modified in place comes back as the stored object itself, so
+        # that still counts as a change
+        key = parts[-1]
+        if key in config:
+            current = config[key]
+            if current == value and (
+                current is not value or not isinstance(value, (dict, list))
+            ):
+                return
+
         # Set the value
-        config[parts[-1]] = value
+        config[key] = value
         self.save()
 
+    def update_many(self, items: Dict[str, Any]) -> None:
+        """Set several configuration values, saving the file once.
+
+        Args:
+            items: Mapping of dot-notation paths to the values to set
+        """
+        with self.batch():
+            for key_path, value in items.items():
+                self.set(key_path, value)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Defer saving until the end of the block, to write the file once.
+
+        The configuration is saved on exit if anything was set inside the
+        block, even when the block raises.
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._save_pending:
+                self.save()
+
     def save(self) -> None:
         """Save the configuration to file with error handling and backup."""
+        if self._batch_depth:
+            self._save_pending = True
+            return
+        self._save_pending = False
+
         # Create backup of existing config file if it exists
         if self.config_path.exists():
             backup_path = self.config_path.with_suffix(".yaml.bak")
             try:
-                import shutil
-
                 shutil.copy2(self.config_path, backup_path)
             except Exception as e:
                 print(f"Warning: Failed to create config backup: {e}")
@@ -239,8 +347,9 @@ class UserConfigManager:
         try:
             # Write to a temporary file first
             temp_path = self.config_path.with_suffix(".yaml.tmp")
-            with open(temp_path, "w") as f:
-                yaml.safe_dump(self.config, f)
+            temp_path.write_bytes(
+                yaml.dump(self.config, Dumper=_YamlDumper, encoding="utf-8")
+            )
 
             # Set secure permissions on temp file
             os.chmod(temp_path, 0o600)
@@ -255,8 +364,6 @@ class UserConfigManager:
             backup_path = self.config_path.with_suffix(".yaml.bak")
             if backup_path.exists():
                 try:
-                    import shutil
-
                     shutil.copy2(backup_path, self.config_path)
                     print("Restored configuration from backup")
                 except Exception as restore_error:
@@ -281,23 +388,15 @@ class UserConfigManager:
 
         # Process the legacy service configurations and map to environment variables
         # BUT EXCLUDE API KEYS - they're now handled by cubbi_init
-        for config_path, env_var in LEGACY_ENV_MAPPINGS.items():
-            # Skip API key environment variables - let cubbi_init handle them
-            if any(
-                key_word in env_var.upper() for key_word in ["API_KEY", "SECRET_KEY"]
-            ):
-                continue
-
-            value = self.get(config_path)
+        services = self.config.get("services") or {}
+        for (service, setting), env_var in _SERVICE_ENV_TABLE.items():
+            value = (services.get(service) or {}).get(setting)
             if value:
                 # Handle environment variable references
-                if (
-                    isinstance(value, str)
-                    and value.startswith("${")
-                    and value.endswith("}")
-                ):
-                    env_var_name = value[2:-1]
-                    value = os.environ.get(env_var_name, "")
+                if isinstance(value, str):
+                    match = _ENV_REF_RE.fullmatch(value)
+                    if match:
+                        value = os.environ.get(match.group(1), "")
 
                 env_vars[env_var] = str(value)
 
@@ -327,11 +426,8 @@ class UserConfigManager:
         base_url = provider_config.get("base_url")
 
         # Resolve environment variable references
-        if api_key.startswith("${") and api_key.endswith("}"):
-            env_var_name = api_key[2:-1]
-            resolved_api_key = os.environ.get(env_var_name, "")
-        else:
-            resolved_api_key = api_key
+        match = _ENV_REF_RE.fullmatch(api_key)
+        resolved_api_key = os.environ.get(match.group(1), "") if match else api_key
 
         if not resolved_api_key:
             return env_vars
@@ -372,25 +468,23 @@ class UserConfigManager:
             A list of (key, value) tuples with flattened key paths.
         """
         result = []
+        stack = [("", self.config)]
 
-        def _flatten_dict(d, prefix=""):
+        while stack:
+            prefix, d = stack.pop()
             for key, value in d.items():
                 full_key = f"{prefix}.{key}" if prefix else key
                 if isinstance(value, dict):
-                    _flatten_dict(value, full_key)
-                else:
-                    # Mask sensitive values
-                    if any(
-                        substr in full_key.lower()
-                        for substr in ["key", "token", "secret", "password"]
-                    ):
-                        displayed_value = "*****" if value else value
-                    else:
-                        displayed_value = value
-                    result.append((full_key, displayed_value))
-
-        _flatten_dict(self.config)
-        return sorted(result)
+                    stack.append((full_key, value))
+                    continue
+
+                # Mask sensitive values
+                if value and _SENSITIVE_RE.search(full_key):
+                    value = "*****"
+                result.append((full_key, value))
+
+        result.sort()
+        return result
 
     def _auto_discover_providers(self, config: Dict[str, Any]) -> None:
         """Auto-discover providers from environment variables."""
@@ -480,11 +574,8 @@ class UserConfigManager:
 
         # Resolve environment variable references in API key
         api_key = provider_config.get("api_key", "")
-        if api_key.startswith("${") and api_key.endswith("}"):
-            env_var_name = api_key[2:-1]
-            resolved_api_key = os.environ.get(env_var_name, "")
-        else:
-            resolved_api_key = api_key
+        match = _ENV_REF_RE.fullmatch(api_key)
+        resolved_api_key = os.environ.get(match.group(1), "") if match else api_key
 
         return {
             "provider_name": provider_name,
@@ -557,10 +648,11 @@ class UserConfigManager:
         mcps = [mcp for mcp in mcps if mcp.get("name") != name]
 
         if len(mcps) < original_length:
-            self.set("mcps", mcps)
+            with self.batch():
+                self.set("mcps", mcps)
 
-            # Also remove from defaults if it's there
-            self.remove_mcp(name)
+                # Also remove from defaults if it's there
+                self.remove_mcp(name)
             return True
         return False
 
@@ -738,8 +830,6 @@ class UserConfigManager:
 
     def supports_model_fetching(self, provider_name: str) -> bool:
         """Check if a provider supports model fetching via API."""
-        from .config import PROVIDER_DEFAULT_URLS
-
         provider = self.get_provider(provider_name)
         if not provider:
             return False
@@ -2,10 +2,11 @@
 Common test fixtures for Cubbi Container tests.
 """
 
+import functools
 import tempfile
 import uuid
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import docker
 import pytest
@@ -17,7 +18,8 @@ from cubbi.session import SessionManager
 from cubbi.user_config import UserConfigManager
 
 
-# Check if Docker is available
+# Check if Docker is available, once per test run
+@functools.cache
 def is_docker_available():
     """Check if Docker is available and running."""
     try:
@@ -35,11 +37,22 @@ def pytest_configure(config):
     )
 
 
+# Skip Docker-dependent tests at collection, before any of their fixtures are
+# set up. Docker is only queried when such a test was collected
+def pytest_collection_modifyitems(config, items):
+    docker_items = [
+        item for item in items if item.get_closest_marker("requires_docker")
+    ]
+    if not docker_items or is_docker_available():
+        return
+
+    skip_docker = pytest.mark.skip(reason="Docker is not available or not running")
+    for item in docker_items:
+        item.add_marker(skip_docker)
+
+
 # Decorator to mark tests that require Docker
-requires_docker = pytest.mark.skipif(
-    not is_docker_available(),
-    reason="Docker is not available or not running",
-)
+requires_docker = pytest.mark.requires_docker
 
 
 @pytest.fixture
@@ -73,8 +86,30 @@ def mock_container_manager(isolate_cubbi_config):
 
 
 @pytest.fixture
+def mock_mcp_manager(isolate_cubbi_config):
+    """Replace the CLI's MCP manager with a Mock, for tests that stub its calls."""
+    from cubbi import cli
+    from cubbi.mcp import MCPManager
+
+    with patch.object(cli, "mcp_manager", Mock(spec=MCPManager)) as mcp_manager:
+        yield mcp_manager
+
+
+@pytest.fixture
+def mock_docker_client(monkeypatch):
+    """Replace the Docker client that ContainerManager connects with by a Mock."""
+    client = Mock()
+    client.ping.return_value = True
+    monkeypatch.setattr("cubbi.container.docker.from_env", lambda **kwargs: client)
+    return client
+
+
+@pytest.fixture(scope="session")
 def cli_runner():
-    """Provide a CLI runner for testing commands."""
+    """Provide a CLI runner for testing commands, shared by the whole session.
+
+    CliRunner keeps no state between invoke() calls.
+    """
     from typer.testing import CliRunner
 
     return CliRunner()
@@ -139,13 +174,17 @@ def isolate_cubbi_config(temp_config_dir):
         isolated_config_manager, isolated_session_manager, isolated_user_config
     )
 
-    # Patch all the global instances in cli.py and the UserConfigManager class
+    # Patch all the global instances in cli.py and the UserConfigManager class.
+    # Patching the module object directly skips resolving the dotted target
+    # for each of these patches on every test
+    from cubbi import cli
+
     with (
-        patch("cubbi.cli.config_manager", isolated_config_manager),
-        patch("cubbi.cli.user_config", isolated_user_config),
-        patch("cubbi.cli.session_manager", isolated_session_manager),
-        patch("cubbi.cli.container_manager", isolated_container_manager),
-        patch("cubbi.cli.UserConfigManager", return_value=isolated_user_config),
+        patch.object(cli, "config_manager", isolated_config_manager),
+        patch.object(cli, "user_config", isolated_user_config),
+        patch.object(cli, "session_manager", isolated_session_manager),
+        patch.object(cli, "container_manager", isolated_container_manager),
+        patch.object(cli, "UserConfigManager", return_value=isolated_user_config),
     ):
         # Create isolated MCP manager with isolated user config
         from cubbi.mcp import MCPManager
@@ -153,7 +192,7 @@ def isolate_cubbi_config(temp_config_dir):
         isolated_mcp_manager = MCPManager(config_manager=isolated_user_config)
 
         # Patch the global mcp_manager instance
-        with patch("cubbi.cli.mcp_manager", isolated_mcp_manager):
+        with patch.object(cli, "mcp_manager", isolated_mcp_manager):
             yield {
                 "config_manager": isolated_config_manager,
                 "user_config": isolated_user_config,
@@ -164,6 +203,12 @@ def isolate_cubbi_config(temp_config_dir):
 
 
 @pytest.fixture
-def patched_config_manager(isolate_cubbi_config):
-    """Compatibility fixture - returns the isolated user config."""
-    return isolate_cubbi_config["user_config"]
+def patched_config_manager(isolate_cubbi_config, monkeypatch):
+    """Compatibility fixture - returns the isolated user config.
+
+    Saving is a no-op, so values set by a test stay in the in-memory config
+    instead of being written back to the temporary YAML file on every set.
+    """
+    user_config = isolate_cubbi_config["user_config"]
+    monkeypatch.setattr(user_config, "save", lambda: None)
+    return user_config
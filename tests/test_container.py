@@ -0,0 +1,84 @@
+"""
+Tests for the ContainerManager internals.
+"""
+
+from unittest.mock import Mock, call, patch
+
+import pytest
+
+from cubbi.container import ContainerManager
+
+
+def _summaries(start, count):
+    """Build container summaries with sequential ids"""
+    return [{"Id": f"container-{i}"} for i in range(start, start + count)]
+
+
+def test_iter_session_summaries_pages(mock_docker_client):
+    """Test that each summary is yielded once, anchors after the next page."""
+    pages = [_summaries(0, 10), _summaries(10, 10), _summaries(20, 3)]
+    mock_docker_client.api.containers.side_effect = pages
+
+    container_manager = ContainerManager()
+    yielded = [
+        (summary["Id"], mock_docker_client.api.containers.call_count)
+        for summary in container_manager._iter_session_summaries()
+    ]
+
+    assert [container_id for container_id, _ in yielded] == [
+        f"container-{i}" for i in range(23)
+    ]
+    calls_when_yielded = dict(yielded)
+    assert calls_when_yielded["container-8"] == 1
+    assert calls_when_yielded["container-9"] == 2
+    assert calls_when_yielded["container-19"] == 3
+    assert mock_docker_client.api.containers.call_args_list == [
+        call(all=True, filters={"label": "cubbi.session"}, limit=10),
+        call(
+            all=True,
+            filters={"label": "cubbi.session", "before": "container-9"},
+            limit=10,
+        ),
+        call(
+            all=True,
+            filters={"label": "cubbi.session", "before": "container-19"},
+            limit=10,
+        ),
+    ]
+
+
+def test_iter_session_summaries_stops_without_progress(mock_docker_client):
+    """Test that paging stops when the daemon returns the same page again."""
+    mock_docker_client.api.containers.return_value = _summaries(0, 10)
+
+    container_manager = ContainerManager()
+    summaries = list(container_manager._iter_session_summaries())
+
+    assert [summary["Id"] for summary in summaries] == [
+        f"container-{i}" for i in range(10)
+    ]
+    assert mock_docker_client.api.containers.call_count == 2
+
+
+@pytest.mark.parametrize("init_complete", [True, False])
+def test_get_init_logs_follow_records_completion(
+    mock_docker_client, capsys, init_complete
+):
+    """Test that following init logs only remembers a confirmed completion."""
+    status = b"INIT_COMPLETE=true" if init_complete else b"INIT_COMPLETE=false"
+    container = Mock()
+    # Initialization is still running when following starts
+    container.get_archive.side_effect = [
+        ([b"INIT_COMPLETE=false"], {}),
+        ([status], {}),
+    ]
+    container.exec_run.return_value = Mock(output=iter([(b"init log\n", None)]))
+
+    container_manager = ContainerManager()
+    with patch.object(
+        container_manager, "_get_container_by_session_id", return_value=container
+    ):
+        container_manager.get_init_logs("test-session", follow=True)
+
+    assert "init log" in capsys.readouterr().out
+    assert ("test-session" in container_manager._init_complete) is init_complete
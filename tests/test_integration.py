@@ -1,9 +1,15 @@
 """Integration tests for cubbi images with different model combinations."""
 
+import os
 import subprocess
 import pytest
+from pathlib import Path
 from typing import Dict
 
+from cubbi.cli import app
+from cubbi.config import ConfigManager
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
 
 IMAGES = ["goose", "aider", "opencode", "crush"]
 
@@ -49,10 +55,30 @@ def run_cubbi_command(
         capture_output=True,
         text=True,
         timeout=timeout,
-        cwd="/home/tito/code/monadical/cubbi",
+        cwd=PROJECT_ROOT,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1", "PYTHONHASHSEED": "0"},
     )
 
 
+@pytest.fixture(scope="session")
+def pull_missing_images():
+    """Pull any test image not present locally, once per test session.
+
+    Locally built images are left untouched, and the per-test timeouts no
+    longer have to absorb a first-use pull.
+    """
+    config_manager = ConfigManager()
+    for name in [*IMAGES, "claudecode"]:
+        image = config_manager.get_image(name)
+        if not image:
+            continue
+        inspect = subprocess.run(
+            ["docker", "image", "inspect", image.image], capture_output=True
+        )
+        if inspect.returncode != 0:
+            subprocess.run(["docker", "pull", image.image], capture_output=True)
+
+
 def is_successful_response(result: subprocess.CompletedProcess) -> bool:
     """Check if the cubbi command completed successfully."""
     # Check for successful completion markers
@@ -64,6 +90,7 @@ def is_successful_response(result: subprocess.CompletedProcess) -> bool:
 
 
 @pytest.mark.integration
+@pytest.mark.usefixtures("pull_missing_images")
 @pytest.mark.parametrize("image", IMAGES)
 @pytest.mark.parametrize("model", MODELS)
 def test_image_model_combination(image: str, model: str):
@@ -95,24 +122,19 @@ def test_image_model_combination(image: str, model: str):
 
 
 @pytest.mark.integration
-def test_all_images_available():
+def test_all_images_available(cli_runner):
     """Test that all required images are available for testing."""
-    # Run image list command
-    result = subprocess.run(
-        ["uv", "run", "-m", "cubbi.cli", "image", "list"],
-        capture_output=True,
-        text=True,
-        timeout=30,
-        cwd="/home/tito/code/monadical/cubbi",
-    )
+    # Run image list command in-process, it does not need a session
+    result = cli_runner.invoke(app, ["image", "list"])
 
-    assert result.returncode == 0, f"Failed to list images: {result.stderr}"
+    assert result.exit_code == 0, f"Failed to list images: {result.output}"
 
     for image in IMAGES:
-        assert image in result.stdout, f"Image {image} not found in available images"
+        assert image in result.output, f"Image {image} not found in available images"
 
 
 @pytest.mark.integration
+@pytest.mark.usefixtures("pull_missing_images")
 def test_claudecode():
     """Test Claude Code without model preselection since it only supports Anthropic."""
     command = "claude -p hello"
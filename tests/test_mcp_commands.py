@@ -3,58 +3,41 @@ Tests for the MCP server management commands.
 """
 
 import pytest
-from unittest.mock import patch
-from cubbi.cli import app
+from unittest.mock import Mock, patch
+from cubbi.cli import app, remove_mcp
+from cubbi.container import ContainerManager
+from cubbi.models import Session, SessionStatus
 
 
-def test_mcp_list_empty(cli_runner, patched_config_manager):
+def test_mcp_list_empty(cli_runner, patched_config_manager, mock_mcp_manager):
     """Test the 'cubbi mcp list' command with no MCPs configured."""
     # Make sure mcps is empty
     patched_config_manager.set("mcps", [])
+    mock_mcp_manager.list_mcps.return_value = []
 
-    with patch("cubbi.cli.mcp_manager.list_mcps") as mock_list_mcps:
-        mock_list_mcps.return_value = []
-
-        result = cli_runner.invoke(app, ["mcp", "list"])
+    result = cli_runner.invoke(app, ["mcp", "list"])
 
-        assert result.exit_code == 0
-        assert "No MCP servers configured" in result.stdout
+    assert result.exit_code == 0
+    assert "No MCP servers configured" in result.stdout
 
 
-def test_mcp_add_remote(cli_runner, isolate_cubbi_config):
-    """Test adding a remote MCP server and listing it."""
-    # Add a remote MCP server
-    result = cli_runner.invoke(
-        app,
-        [
+# (add command, confirmation, stored MCP type) per add command. The other
+# stored settings are checked through the manager instead
+MCP_ADD_CASES = [
+    (
+        (
             "mcp",
             "add-remote",
             "test-remote-mcp",
             "http://mcp-server.example.com/sse",
             "--header",
             "Authorization=Bearer test-token",
-        ],
-    )
-
-    assert result.exit_code == 0
-    assert "Added remote MCP server" in result.stdout
-
-    # List MCP servers
-    result = cli_runner.invoke(app, ["mcp", "list"])
-
-    assert result.exit_code == 0
-    assert "test-remote-mcp" in result.stdout
-    assert "remote" in result.stdout
-    # Check partial URL since it may be truncated in the table display
-    assert "http://mcp-se" in result.stdout  # Truncated in table view
-
-
-def test_mcp_add(cli_runner, isolate_cubbi_config):
-    """Test adding a proxy-based MCP server and listing it."""
-    # Add a Docker MCP server
-    result = cli_runner.invoke(
-        app,
-        [
+        ),
+        "Added remote MCP server",
+        "remote",
+    ),
+    (
+        (
             "mcp",
             "add",
             "test-docker-mcp",
@@ -63,22 +46,87 @@ def test_mcp_add(cli_runner, isolate_cubbi_config):
             "github-mcp",
             "--env",
             "GITHUB_TOKEN=test-token",
-        ],
+        ),
+        "Added MCP server",
+        "proxy",  # It's a proxy-based MCP
+    ),
+]
+
+
+def test_mcp_manager_add_and_list(isolate_cubbi_config):
+    """Test that MCP servers added through the manager are listed with their settings."""
+    mcp_manager = isolate_cubbi_config["mcp_manager"]
+
+    mcp_manager.add_remote_mcp(
+        "test-remote-mcp",
+        "http://mcp-server.example.com/sse",
+        headers={"Authorization": "Bearer test-token"},
+    )
+    mcp_manager.add_docker_mcp(
+        "test-docker-mcp",
+        "mcp/github:latest",
+        "github-mcp",
+        env={"GITHUB_TOKEN": "test-token"},
     )
 
+    mcps = {mcp["name"]: mcp for mcp in mcp_manager.list_mcps()}
+    assert mcps["test-remote-mcp"]["type"] == "remote"
+    assert mcps["test-remote-mcp"]["url"] == "http://mcp-server.example.com/sse"
+    assert mcps["test-remote-mcp"]["headers"] == {"Authorization": "Bearer test-token"}
+    assert mcps["test-docker-mcp"]["type"] == "docker"
+    assert mcps["test-docker-mcp"]["image"] == "mcp/github:latest"
+    assert mcps["test-docker-mcp"]["command"] == "github-mcp"
+    assert mcps["test-docker-mcp"]["env"] == {"GITHUB_TOKEN": "test-token"}
+
+
+@pytest.mark.parametrize(
+    "argv, confirmation, mcp_type", MCP_ADD_CASES, ids=["add-remote", "add-proxy"]
+)
+def test_mcp_add(cli_runner, isolate_cubbi_config, argv, confirmation, mcp_type):
+    """Test adding remote and proxy-based MCP servers."""
+    result = cli_runner.invoke(app, argv)
+
     assert result.exit_code == 0
-    assert "Added MCP server" in result.stdout
+    assert confirmation in result.stdout
+    assert isolate_cubbi_config["mcp_manager"].get_mcp(argv[2])["type"] == mcp_type
+
+
+def test_mcp_list(cli_runner, patched_config_manager):
+    """Test listing configured remote and proxy-based MCP servers."""
+    patched_config_manager.set(
+        "mcps",
+        [
+            {
+                "name": "test-remote-mcp",
+                "type": "remote",
+                "url": "http://mcp-server.example.com/sse",
+            },
+            {
+                "name": "test-docker-mcp",
+                "type": "proxy",
+                "base_image": "mcp/github:latest",
+                "proxy_image": "ghcr.io/sparfenyuk/mcp-proxy:latest",
+                "command": "github-mcp",
+                "proxy_options": {"sse_port": 8080},
+            },
+        ],
+    )
 
-    # List MCP servers
     result = cli_runner.invoke(app, ["mcp", "list"])
 
     assert result.exit_code == 0
-    assert "test-docker-mcp" in result.stdout
-    assert "proxy" in result.stdout  # It's a proxy-based MCP
-    assert "mcp/github:la" in result.stdout  # Truncated in table view
+    output = result.stdout
+    missing = [
+        fragment
+        for fragment in ("test-remote-mcp", "remote", "test-docker-mcp", "proxy")
+        if fragment not in output
+    ]
+    assert not missing, missing
 
 
-def test_mcp_remove(cli_runner, patched_config_manager):
+def test_mcp_remove(
+    capsys, patched_config_manager, mock_container_manager, mock_mcp_manager
+):
     """Test removing an MCP server."""
     # Add a remote MCP server
     patched_config_manager.set(
@@ -93,27 +141,21 @@ def test_mcp_remove(cli_runner, patched_config_manager):
         ],
     )
 
-    # Mock the container_manager.list_sessions to return sessions without MCPs
-    with patch("cubbi.cli.container_manager.list_sessions") as mock_list_sessions:
-        mock_list_sessions.return_value = []
+    # No sessions use the MCP, and the removal succeeds
+    mock_container_manager.list_sessions.return_value = []
+    mock_mcp_manager.remove_mcp.return_value = True
 
-        # Mock the remove_mcp method
-        with patch("cubbi.cli.mcp_manager.remove_mcp") as mock_remove_mcp:
-            # Make remove_mcp return True (successful removal)
-            mock_remove_mcp.return_value = True
+    # Remove the MCP server. Argument parsing is covered by the other remove
+    # tests, so call the command directly
+    remove_mcp(name="test-mcp")
 
-            # Remove the MCP server
-            result = cli_runner.invoke(app, ["mcp", "remove", "test-mcp"])
+    assert "Removed MCP server 'test-mcp'" in capsys.readouterr().out
 
-            # Just check it ran successfully with exit code 0
-            assert result.exit_code == 0
-            assert "Removed MCP server 'test-mcp'" in result.stdout
 
-
-def test_mcp_remove_with_active_sessions(cli_runner, patched_config_manager):
+def test_mcp_remove_with_active_sessions(
+    cli_runner, patched_config_manager, mock_container_manager, mock_mcp_manager
+):
     """Test removing an MCP server that is used by active sessions."""
-    from cubbi.models import Session, SessionStatus
-
     # Add a remote MCP server
     patched_config_manager.set(
         "mcps",
@@ -155,56 +197,45 @@ def test_mcp_remove_with_active_sessions(cli_runner, patched_config_manager):
         ),
     ]
 
-    # Mock the container_manager.list_sessions to return our sessions
-    with patch("cubbi.cli.container_manager.list_sessions") as mock_list_sessions:
-        mock_list_sessions.return_value = mock_sessions
+    # Return our sessions, and make the removal succeed
+    mock_container_manager.list_sessions.return_value = mock_sessions
+    mock_mcp_manager.remove_mcp.return_value = True
 
-        # Mock the remove_mcp method
-        with patch("cubbi.cli.mcp_manager.remove_mcp") as mock_remove_mcp:
-            # Make remove_mcp return True (successful removal)
-            mock_remove_mcp.return_value = True
+    # Remove the MCP server
+    result = cli_runner.invoke(app, ["mcp", "remove", "test-mcp"])
 
-            # Remove the MCP server
-            result = cli_runner.invoke(app, ["mcp", "remove", "test-mcp"])
-
-            # Check it ran successfully with exit code 0
-            assert result.exit_code == 0
-            assert "Removed MCP server 'test-mcp'" in result.stdout
-            # Check warning about affected sessions
-            assert (
-                "Warning: Found 2 active sessions using MCP 'test-mcp'" in result.stdout
-            )
-            assert "session-1" in result.stdout
-            assert "session-3" in result.stdout
-            # session-2 should not be mentioned since it doesn't use test-mcp
-            assert "session-2" not in result.stdout
-
-
-def test_mcp_remove_nonexistent(cli_runner, patched_config_manager):
+    # Check it ran successfully with exit code 0
+    assert result.exit_code == 0
+    assert "Removed MCP server 'test-mcp'" in result.stdout
+    # Check warning about affected sessions
+    assert "Warning: Found 2 active sessions using MCP 'test-mcp'" in result.stdout
+    assert "session-1" in result.stdout
+    assert "session-3" in result.stdout
+    # session-2 should not be mentioned since it doesn't use test-mcp
+    assert "session-2" not in result.stdout
+
+
+def test_mcp_remove_nonexistent(
+    cli_runner, patched_config_manager, mock_container_manager, mock_mcp_manager
+):
     """Test removing a non-existent MCP server."""
     # No MCPs configured
     patched_config_manager.set("mcps", [])
 
-    # Mock the container_manager.list_sessions to return empty list
-    with patch("cubbi.cli.container_manager.list_sessions") as mock_list_sessions:
-        mock_list_sessions.return_value = []
+    # No sessions, and remove_mcp reports the MCP as not found
+    mock_container_manager.list_sessions.return_value = []
+    mock_mcp_manager.remove_mcp.return_value = False
 
-        # Mock the remove_mcp method to return False (MCP not found)
-        with patch("cubbi.cli.mcp_manager.remove_mcp") as mock_remove_mcp:
-            mock_remove_mcp.return_value = False
+    # Try to remove a non-existent MCP server
+    result = cli_runner.invoke(app, ["mcp", "remove", "nonexistent-mcp"])
 
-            # Try to remove a non-existent MCP server
-            result = cli_runner.invoke(app, ["mcp", "remove", "nonexistent-mcp"])
-
-            # Check it ran successfully but reported not found
-            assert result.exit_code == 0
-            assert "MCP server 'nonexistent-mcp' not found" in result.stdout
+    # Check it ran successfully but reported not found
+    assert result.exit_code == 0
+    assert "MCP server 'nonexistent-mcp' not found" in result.stdout
 
 
 def test_session_mcps_attribute():
     """Test that Session model has mcps attribute and can be populated correctly."""
-    from cubbi.models import Session, SessionStatus
-
     # Test that Session can be created with mcps attribute
     session = Session(
         id="test-session",
@@ -229,144 +260,112 @@ def test_session_mcps_attribute():
     assert session_empty.mcps == []  # Should default to empty list
 
 
-def test_session_mcps_from_container_labels():
+def test_session_mcps_from_container_labels(mock_docker_client):
     """Test that Session mcps are correctly populated from container labels."""
-    from unittest.mock import Mock
-    from cubbi.container import ContainerManager
-
-    # Mock a container with MCP labels
-    mock_container = Mock()
-    mock_container.id = "test-container-id"
-    mock_container.status = "running"
-    mock_container.labels = {
-        "cubbi.session": "true",
-        "cubbi.session.id": "test-session",
-        "cubbi.session.name": "test-session-name",
-        "cubbi.image": "goose",
-        "cubbi.mcps": "mcp1,mcp2,mcp3",  # Test with multiple MCPs
+    # Mock a container summary with MCP labels, as returned by the low-level API
+    container_summary = {
+        "Id": "test-container-id",
+        "State": "running",
+        "Labels": {
+            "cubbi.session": "true",
+            "cubbi.session.id": "test-session",
+            "cubbi.session.name": "test-session-name",
+            "cubbi.image": "goose",
+            "cubbi.mcps": "mcp1,mcp2,mcp3",  # Test with multiple MCPs
+        },
+        "Ports": [],
     }
-    mock_container.attrs = {"NetworkSettings": {"Ports": {}}}
 
-    # Mock Docker client
-    mock_client = Mock()
-    mock_client.containers.list.return_value = [mock_container]
+    mock_docker_client.api.containers.return_value = [container_summary]
 
-    # Create container manager with mocked client
-    with patch("cubbi.container.docker.from_env") as mock_docker:
-        mock_docker.return_value = mock_client
-        mock_client.ping.return_value = True
+    container_manager = ContainerManager()
+    sessions = container_manager.list_sessions()
 
-        container_manager = ContainerManager()
-        sessions = container_manager.list_sessions()
+    assert len(sessions) == 1
+    session = sessions[0]
+    assert session.id == "test-session"
+    assert session.mcps == ["mcp1", "mcp2", "mcp3"]
 
-        assert len(sessions) == 1
-        session = sessions[0]
-        assert session.id == "test-session"
-        assert session.mcps == ["mcp1", "mcp2", "mcp3"]
 
-
-def test_session_mcps_from_empty_container_labels():
+def test_session_mcps_from_empty_container_labels(mock_docker_client):
     """Test that Session mcps are correctly handled when container has no MCP labels."""
-    from unittest.mock import Mock
-    from cubbi.container import ContainerManager
-
-    # Mock a container without MCP labels
-    mock_container = Mock()
-    mock_container.id = "test-container-id"
-    mock_container.status = "running"
-    mock_container.labels = {
-        "cubbi.session": "true",
-        "cubbi.session.id": "test-session",
-        "cubbi.session.name": "test-session-name",
-        "cubbi.image": "goose",
-        # No cubbi.mcps label
+    # Mock a container summary without MCP labels, as returned by the low-level API
+    container_summary = {
+        "Id": "test-container-id",
+        "State": "running",
+        "Labels": {
+            "cubbi.session": "true",
+            "cubbi.session.id": "test-session",
+            "cubbi.session.name": "test-session-name",
+            "cubbi.image": "goose",
+            # No cubbi.mcps label
+        },
+        "Ports": [],
     }
-    mock_container.attrs = {"NetworkSettings": {"Ports": {}}}
 
-    # Mock Docker client
-    mock_client = Mock()
-    mock_client.containers.list.return_value = [mock_container]
+    mock_docker_client.api.containers.return_value = [container_summary]
+
+    container_manager = ContainerManager()
+    sessions = container_manager.list_sessions()
+
+    assert len(sessions) == 1
+    session = sessions[0]
+    assert session.id == "test-session"
+    assert session.mcps == []  # Should be empty list when no MCPs
 
-    # Create container manager with mocked client
-    with patch("cubbi.container.docker.from_env") as mock_docker:
-        mock_docker.return_value = mock_client
-        mock_client.ping.return_value = True
 
-        container_manager = ContainerManager()
-        sessions = container_manager.list_sessions()
+# Docker MCP configuration shared by the server lifecycle tests
+DOCKER_MCP_CONFIG = {
+    "name": "test-docker-mcp",
+    "type": "docker",
+    "image": "mcp/test:latest",
+    "command": "test-command",
+}
 
-        assert len(sessions) == 1
-        session = sessions[0]
-        assert session.id == "test-session"
-        assert session.mcps == []  # Should be empty list when no MCPs
+
+@pytest.fixture
+def docker_mcp(patched_config_manager):
+    """Add the test Docker MCP to the isolated user config."""
+    patched_config_manager.set("mcps", [dict(DOCKER_MCP_CONFIG)])
+    return DOCKER_MCP_CONFIG
 
 
 @pytest.mark.requires_docker
-def test_mcp_status(cli_runner, patched_config_manager, mock_container_manager):
+def test_mcp_status(cli_runner, docker_mcp, mock_container_manager, mock_mcp_manager):
     """Test the MCP status command."""
-    # Add a Docker MCP
-    patched_config_manager.set(
-        "mcps",
-        [
-            {
-                "name": "test-docker-mcp",
-                "type": "docker",
-                "image": "mcp/test:latest",
-                "command": "test-command",
-                "env": {"TEST_ENV": "test-value"},
-            }
-        ],
-    )
-
-    # First mock get_mcp to return our MCP config
-    with patch("cubbi.cli.mcp_manager.get_mcp") as mock_get_mcp:
-        mock_get_mcp.return_value = {
-            "name": "test-docker-mcp",
-            "type": "docker",
-            "image": "mcp/test:latest",
-            "command": "test-command",
-            "env": {"TEST_ENV": "test-value"},
-        }
-
-        # Then mock the get_mcp_status method
-        with patch("cubbi.cli.mcp_manager.get_mcp_status") as mock_get_status:
-            mock_get_status.return_value = {
-                "status": "running",
-                "container_id": "test-container-id",
-                "name": "test-docker-mcp",
-                "type": "docker",
-                "image": "mcp/test:latest",
-                "ports": {"8080/tcp": 8080},
-                "created": "2023-01-01T00:00:00Z",
-            }
+    # Return our MCP config and a running status for it
+    mock_mcp_manager.get_mcp.return_value = {
+        **DOCKER_MCP_CONFIG,
+        "env": {"TEST_ENV": "test-value"},
+    }
+    mock_mcp_manager.get_mcp_status.return_value = {
+        "status": "running",
+        "container_id": "test-container-id",
+        "name": "test-docker-mcp",
+        "type": "docker",
+        "image": "mcp/test:latest",
+        "ports": {"8080/tcp": 8080},
+        "created": "2023-01-01T00:00:00Z",
+    }
 
-            # Check MCP status
-            result = cli_runner.invoke(app, ["mcp", "status", "test-docker-mcp"])
+    # Check MCP status
+    result = cli_runner.invoke(app, ["mcp", "status", "test-docker-mcp"])
 
-            assert result.exit_code == 0
-            assert "test-docker-mcp" in result.stdout
-            assert "running" in result.stdout
-            assert "mcp/test:latest" in result.stdout
+    assert result.exit_code == 0
+    output = result.stdout
+    missing = [
+        expected
+        for expected in ("test-docker-mcp", "running", "mcp/test:latest")
+        if expected not in output
+    ]
+    assert not missing, missing
 
 
 @pytest.mark.requires_docker
-def test_mcp_start(cli_runner, isolate_cubbi_config):
+def test_mcp_start(cli_runner, isolate_cubbi_config, docker_mcp):
     """Test starting an MCP server."""
     mcp_manager = isolate_cubbi_config["mcp_manager"]
 
-    # Add a Docker MCP
-    isolate_cubbi_config["user_config"].set(
-        "mcps",
-        [
-            {
-                "name": "test-docker-mcp",
-                "type": "docker",
-                "image": "mcp/test:latest",
-                "command": "test-command",
-            }
-        ],
-    )
-
     # Mock the start_mcp method to avoid actual Docker operations
     with patch.object(
         mcp_manager,
@@ -384,24 +383,49 @@ def test_mcp_start(cli_runner, isolate_cubbi_config):
         assert "test-docker-mcp" in result.stdout
 
 
+@pytest.mark.parametrize(
+    "config_label, recreated",
+    [("current", False), ("outdated", True), (None, False)],
+    ids=["label-matches", "label-differs", "no-label"],
+)
+def test_mcp_start_existing_container(
+    isolate_cubbi_config, docker_mcp, config_label, recreated
+):
+    """Test that an existing MCP container is only recreated when its config changed."""
+    mcp_manager = isolate_cubbi_config["mcp_manager"]
+    if config_label == "current":
+        config_label = mcp_manager._mcp_config_hash(
+            mcp_manager.get_mcp("test-docker-mcp")
+        )
+
+    container = Mock(id="existing-container-id", status="running")
+    container.labels = {"cubbi.mcp": "true"}
+    if config_label is not None:
+        container.labels["cubbi.mcp.config"] = config_label
+    client = Mock()
+    client.containers.get.return_value = container
+    client.containers.run.return_value = Mock(id="new-container-id")
+    client.networks.list.return_value = [Mock()]
+
+    with patch.object(mcp_manager, "client", client):
+        result = mcp_manager.start_mcp("test-docker-mcp")
+
+    assert result["status"] == "running"
+    if recreated:
+        container.remove.assert_called_once_with(force=True)
+        client.containers.run.assert_called_once()
+        assert result["container_id"] == "new-container-id"
+    else:
+        container.remove.assert_not_called()
+        client.containers.run.assert_not_called()
+        assert result["container_id"] == "existing-container-id"
+
+
 @pytest.mark.requires_docker
-def test_mcp_stop(cli_runner, isolate_cubbi_config):
+def test_mcp_stop(cli_runner, isolate_cubbi_config, docker_mcp):
     """Test stopping an MCP server."""
     mcp_manager = isolate_cubbi_config["mcp_manager"]
 
-    # Add a Docker MCP
-    isolate_cubbi_config["user_config"].set(
-        "mcps",
-        [
-            {
-                "name": "test-docker-mcp",
-                "type": "docker",
-                "image": "mcp/test:latest",
-                "command": "test-command",
-            }
-        ],
-    )
-
     # Mock the stop_mcp method to avoid actual Docker operations
     with patch.object(mcp_manager, "stop_mcp", return_value=True):
         # Stop the MCP
@@ -413,23 +437,10 @@ def test_mcp_stop(cli_runner, isolate_cubbi_config):
 
 
 @pytest.mark.requires_docker
-def test_mcp_restart(cli_runner, isolate_cubbi_config):
+def test_mcp_restart(cli_runner, isolate_cubbi_config, docker_mcp):
     """Test restarting an MCP server."""
     mcp_manager = isolate_cubbi_config["mcp_manager"]
 
-    # Add a Docker MCP
-    isolate_cubbi_config["user_config"].set(
-        "mcps",
-        [
-            {
-                "name": "test-docker-mcp",
-                "type": "docker",
-                "image": "mcp/test:latest",
-                "command": "test-command",
-            }
-        ],
-    )
-
     # Mock the restart_mcp method to avoid actual Docker operations
     with patch.object(
         mcp_manager,
@@ -448,30 +459,28 @@ def test_mcp_restart(cli_runner, isolate_cubbi_config):
 
 
 @pytest.mark.requires_docker
-def test_mcp_logs(cli_runner, patched_config_manager, mock_container_manager):
+def test_mcp_logs(cli_runner, docker_mcp, mock_container_manager, mock_mcp_manager):
     """Test viewing MCP server logs."""
-    # Add a Docker MCP
-    patched_config_manager.set(
-        "mcps",
-        [
-            {
-                "name": "test-docker-mcp",
-                "type": "docker",
-                "image": "mcp/test:latest",
-                "command": "test-command",
-            }
-        ],
-    )
-
     # Mock the logs operation
-    with patch("cubbi.cli.mcp_manager.get_mcp_logs") as mock_get_logs:
-        mock_get_logs.return_value = "Test log output"
+    mock_mcp_manager.stream_mcp_logs.return_value = iter([b"Test log output"])
 
-        # View MCP logs
-        result = cli_runner.invoke(app, ["mcp", "logs", "test-docker-mcp"])
+    # View MCP logs
+    result = cli_runner.invoke(app, ["mcp", "logs", "test-docker-mcp"])
 
-        assert result.exit_code == 0
-        assert "Test log output" in result.stdout
+    assert result.exit_code == 0
+    assert "Test log output" in result.stdout
+
+
+def test_mcp_logs_remote(cli_runner, isolate_cubbi_config):
+    """Test that the no-logs message of a remote MCP server ends its line."""
+    isolate_cubbi_config["mcp_manager"].add_remote_mcp(
+        "test-remote-mcp", "http://mcp-server.example.com/sse"
+    )
+
+    result = cli_runner.invoke(app, ["mcp", "logs", "test-remote-mcp"])
+
+    assert result.exit_code == 0
+    assert result.stdout == "Remote MCPs don't have local logs\n"
 
 
 def test_session_with_mcp(cli_runner, patched_config_manager, mock_container_manager):
@@ -490,8 +499,6 @@ def test_session_with_mcp(cli_runner, patched_config_manager, mock_container_man
     )
 
     # Mock the session creation with MCP
-    from cubbi.models import Session, SessionStatus
-
     # timestamp no longer needed since we don't use created_at in Session
     mock_container_manager.create_session.return_value = Session(
         id="test-session-id",
@@ -509,8 +516,8 @@ def test_session_with_mcp(cli_runner, patched_config_manager, mock_container_man
     assert "Session created successfully" in result.stdout
     assert "test-session" in result.stdout
     # Check that the create_session was called with the mcp parameter
-    assert mock_container_manager.create_session.called
-    # The keyword arguments are in the second element of call_args
-    kwargs = mock_container_manager.create_session.call_args[1]
+    create_session = mock_container_manager.create_session
+    assert create_session.called
+    kwargs = create_session.call_args.kwargs
     assert "mcp" in kwargs
     assert "test-mcp" in kwargs["mcp"]
@@ -0,0 +1,29 @@
+"""
+Tests for the user configuration manager.
+"""
+
+from cubbi.user_config import _PARSED_CONFIGS, UserConfigManager
+
+
+def test_parsed_config_is_copied_per_manager(tmp_path):
+    """Test that a manager can mutate its config without affecting the cache."""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("defaults:\n  image: goose\n")
+
+    first_manager = UserConfigManager(str(config_path))
+    first_manager.config["defaults"]["image"] = "mutated"
+    second_manager = UserConfigManager(str(config_path))
+    second_manager.config["defaults"]["image"] = "mutated"
+
+    assert _PARSED_CONFIGS[config_path][1]["defaults"]["image"] == "goose"
+    assert UserConfigManager(str(config_path)).get("defaults.image") == "goose"
+
+
+def test_parsed_config_reflects_saved_changes(tmp_path):
+    """Test that a value set through one manager is seen by the next one."""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("defaults:\n  image: goose\n")
+
+    UserConfigManager(str(config_path)).set("defaults.image", "claudecode")
+
+    assert UserConfigManager(str(config_path)).get("defaults.image") == "claudecode"